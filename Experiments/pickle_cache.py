@@ -0,0 +1,66 @@
+"""
+Best-effort pickle sidecars for the plotting/eval scripts.
+
+A cache is only ever a shortcut: a missing, truncated or incompatible pickle
+reads as "no cache" and the caller parses its source again, and a cache that
+cannot be written (e.g. a read-only data folder) is simply skipped.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# What unpickling a damaged or stale (other pandas/numpy version) file can raise
+_UNPICKLE_ERRORS = (
+    OSError,
+    EOFError,
+    pickle.UnpicklingError,
+    AttributeError,
+    ImportError,
+    IndexError,
+    TypeError,
+    ValueError,
+)
+
+
+def read_cache(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    The dict pickled at path, or None if there is no usable cache there.
+    """
+    try:
+        with open(path, "rb") as f:
+            cached = pickle.load(f)
+    except _UNPICKLE_ERRORS:
+        return None
+    return cached if isinstance(cached, dict) else None
+
+
+def write_cache(path: Path, obj: Dict[str, Any]) -> None:
+    """
+    Pickle obj to path. The pickle goes to a temp file in the same folder that is
+    then renamed over path, so readers never see a partly written cache. Any
+    OSError (read-only folder, full disk, ...) leaves the cache unwritten.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # mkstemp creates the file owner-only; give the cache the usual umask mode
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, path)
+    except BaseException as e:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        if not isinstance(e, OSError):
+            raise
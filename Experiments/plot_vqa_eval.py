@@ -24,34 +24,44 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import functools
+import importlib.util
 import json
 import math
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Any, Tuple, Optional
 
-import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+# Shared best-effort pickle caches. The scripts are run directly from different folders,
+# so each loads Experiments/pickle_cache.py by file path rather than through sys.path.
+_spec = importlib.util.spec_from_file_location("pickle_cache", Path(__file__).resolve().parent / "pickle_cache.py")
+pickle_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pickle_cache)
+
+# Optional faster JSON parser; falls back to the stdlib json module without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # ----------------------------
 # Data structures
 # ----------------------------
 
-@dataclass(frozen=True)
-class DetailRow:
-    preprocessor: str
-    sample_id: str
-    question: str
-    accuracy: float
-
-
 @dataclass(frozen=True)
 class RunEval:
     path: Path
     run_name: str
     overall_accuracy: float
     per_preprocessor: Dict[str, Dict[str, float]]  # {"n": int, "accuracy": float}
-    details: List[DetailRow]
+    # One row per sample: preprocessor (categorical), sample_id, question, accuracy (float64)
+    details_df: pd.DataFrame
 
 
 # ----------------------------
@@ -59,9 +69,13 @@ class RunEval:
 # ----------------------------
 
 def _read_json(path: Path) -> Dict[str, Any]:
+    if orjson is not None:
+        # Parses the raw bytes directly, no separate UTF-8 decode pass
+        return orjson.loads(path.read_bytes())
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+@functools.lru_cache(maxsize=None)
 def _infer_run_name(path: Path) -> str:
     # logs/<run_folder>/vqa_eval.json -> <run_folder>
     if path.parent.name:
@@ -69,28 +83,55 @@ def _infer_run_name(path: Path) -> str:
     return path.stem
 
 
-def _load_run(path: Path) -> RunEval:
+def _cache_path(path: Path) -> Path:
+    # logs/<run_folder>/vqa_eval.json -> logs/<run_folder>/vqa_eval.cache.pkl
+    return path.with_name(path.stem + ".cache.pkl")
+
+
+def _parse_run(path: Path) -> Dict[str, Any]:
     obj = _read_json(path)
     summary = obj.get("summary", {})
     details_raw = obj.get("details", [])
 
-    details: List[DetailRow] = []
-    for r in details_raw:
-        details.append(
-            DetailRow(
-                preprocessor=str(r.get("preprocessor", "UNKNOWN")),
-                sample_id=str(r.get("sample_id", "")),
-                question=str(r.get("question", "")),
-                accuracy=float(r.get("accuracy_official_vqa", 0.0)),
-            )
-        )
+    # Columnar per-sample details; preprocessor repeats a handful of names, so store it as categorical
+    details_df = pd.DataFrame(
+        {
+            "preprocessor": pd.Categorical([str(r.get("preprocessor", "UNKNOWN")) for r in details_raw]),
+            "sample_id": [str(r.get("sample_id", "")) for r in details_raw],
+            "question": [str(r.get("question", "")) for r in details_raw],
+            "accuracy": np.fromiter(
+                (float(r.get("accuracy_official_vqa", 0.0)) for r in details_raw),
+                dtype=np.float64,
+                count=len(details_raw),
+            ),
+        }
+    )
+
+    return {
+        "overall_accuracy": float(summary.get("overall_accuracy_official_vqa", 0.0)),
+        "per_preprocessor": summary.get("per_preprocessor", {}),
+        "details_df": details_df,
+    }
+
+
+def _load_run(path: Path) -> RunEval:
+    # vqa_eval.json does not change once written, so reuse the parsed sidecar
+    # until the JSON's mtime changes.
+    mtime_ns = path.stat().st_mtime_ns
+    cache_path = _cache_path(path)
+
+    parsed = pickle_cache.read_cache(cache_path)
+    if parsed is None or parsed.get("mtime_ns") != mtime_ns:
+        parsed = _parse_run(path)
+        parsed["mtime_ns"] = mtime_ns
+        pickle_cache.write_cache(cache_path, parsed)
 
     return RunEval(
         path=path,
         run_name=_infer_run_name(path),
-        overall_accuracy=float(summary.get("overall_accuracy_official_vqa", 0.0)),
-        per_preprocessor=summary.get("per_preprocessor", {}),
-        details=details,
+        overall_accuracy=parsed["overall_accuracy"],
+        per_preprocessor=parsed["per_preprocessor"],
+        details_df=parsed["details_df"],
     )
 
 
@@ -98,42 +139,58 @@ def _ensure_outdir(outdir: Path) -> None:
     outdir.mkdir(parents=True, exist_ok=True)
 
 
-def _save(fig: plt.Figure, outpath: Path) -> None:
+def _save(fig: Figure, outpath: Path) -> None:
     fig.tight_layout()
     fig.savefig(outpath, dpi=200)
-    plt.close(fig)
 
 
-def _group_details_by_preprocessor(details: List[DetailRow]) -> Dict[str, List[float]]:
-    grouped: Dict[str, List[float]] = {}
-    for d in details:
-        grouped.setdefault(d.preprocessor, []).append(d.accuracy)
-    return grouped
+def _group_details_by_preprocessor(details_df: pd.DataFrame) -> pd.core.groupby.SeriesGroupBy:
+    # Groups are sorted by preprocessor name
+    return details_df.groupby("preprocessor", sort=True, observed=True)["accuracy"]
 
 
-def _bin_score(a: float) -> str:
+SCORE_BINS = ["0", "0.33", "0.66", "1.0"]
+# Midpoints between 0, 1/3, 2/3 and 1
+_SCORE_BIN_EDGES = np.array([1.0 / 6.0, 0.5, 5.0 / 6.0])
+
+
+def _bin_scores(acc: np.ndarray) -> np.ndarray:
     # Official VQAEval yields averages of {0, 0.333..., 0.666..., 1.0} but sometimes shows as 0.3/0.6 in your JSON.
-    # Bin robustly by nearest.
-    bins = [(0.0, "0"), (1.0 / 3.0, "0.33"), (2.0 / 3.0, "0.66"), (1.0, "1.0")]
-    best = min(bins, key=lambda t: abs(a - t[0]))
-    return best[1]
+    # Bin robustly by nearest (ties go to the lower bin).
+    return np.asarray(SCORE_BINS)[np.digitize(acc, _SCORE_BIN_EDGES, right=True)]
+
+
+# Fixed seed so CIs are reproducible. Each call starts a fresh generator from it, so a
+# group's interval does not depend on which groups were bootstrapped before it.
+_BOOTSTRAP_SEED = 1337
 
 
 def _bootstrap_ci_mean(values: List[float], iters: int = 2000, alpha: float = 0.05) -> Tuple[float, float]:
-    # Simple bootstrap with replacement, using Python's random (kept deterministic via seed).
-    import random
-    if not values:
+    # Bootstrap with replacement, vectorized with NumPy (kept deterministic via seed).
+    if len(values) == 0:
         return (0.0, 0.0)
-    rnd = random.Random(1337)
-    n = len(values)
-    means = []
-    for _ in range(iters):
-        samp = [values[rnd.randrange(n)] for _ in range(n)]
-        means.append(sum(samp) / n)
+    arr = np.asarray(values, dtype=np.float64)
+    n = arr.size
+    rng = np.random.default_rng(_BOOTSTRAP_SEED)
+
+    # A resample only changes how often each distinct value is drawn, so draw those counts
+    # from a multinomial. VQA scores take ~4 distinct values, so this is (iters, 4) work
+    # instead of materializing (iters, n) resampled values.
+    uniq, freq = np.unique(arr, return_counts=True)
+    p = freq / n
+
+    # Draw in blocks of iterations so the count matrix stays small for many distinct values.
+    block = max(1, min(iters, (1 << 20) // uniq.size))
+    means = np.empty(iters, dtype=np.float64)
+    for start in range(0, iters, block):
+        stop = min(start + block, iters)
+        draws = rng.multinomial(n, p, size=stop - start)
+        means[start:stop] = draws @ uniq / n
+
     means.sort()
     lo_idx = int((alpha / 2.0) * iters)
     hi_idx = int((1.0 - alpha / 2.0) * iters) - 1
-    return means[lo_idx], means[hi_idx]
+    return float(means[lo_idx]), float(means[hi_idx])
 
 
 # ----------------------------
@@ -145,7 +202,7 @@ def plot_per_preprocessor_accuracy(run: RunEval, outdir: Path) -> None:
     accs = [float(run.per_preprocessor[k]["accuracy"]) for k in keys]
     ns = [int(run.per_preprocessor[k]["n"]) for k in keys]
 
-    fig = plt.figure(figsize=(10, 5))
+    fig = Figure(figsize=(10, 5))
     ax = fig.add_subplot(111)
     ax.bar(keys, accs)
     ax.set_title(f"Accuracy per preprocessor ({run.run_name})")
@@ -161,21 +218,19 @@ def plot_per_preprocessor_accuracy(run: RunEval, outdir: Path) -> None:
 
 
 def plot_per_preprocessor_accuracy_with_ci(run: RunEval, outdir: Path) -> None:
-    grouped = _group_details_by_preprocessor(run.details)
-    keys = sorted(grouped.keys())
-    means = []
+    grouped = _group_details_by_preprocessor(run.details_df)
+    mean_by_key = grouped.mean()
+    keys = mean_by_key.index.tolist()
+    means = mean_by_key.tolist()
     err_lo = []
     err_hi = []
 
-    for k in keys:
-        vals = grouped[k]
-        m = sum(vals) / len(vals) if vals else 0.0
-        lo, hi = _bootstrap_ci_mean(vals)
-        means.append(m)
+    for m, (_, vals) in zip(means, grouped):
+        lo, hi = _bootstrap_ci_mean(vals.to_numpy())
         err_lo.append(m - lo)
         err_hi.append(hi - m)
 
-    fig = plt.figure(figsize=(10, 5))
+    fig = Figure(figsize=(10, 5))
     ax = fig.add_subplot(111)
     ax.bar(keys, means, yerr=[err_lo, err_hi], capsize=4)
     ax.set_title(f"Accuracy per preprocessor with 95% bootstrap CI ({run.run_name})")
@@ -187,27 +242,25 @@ def plot_per_preprocessor_accuracy_with_ci(run: RunEval, outdir: Path) -> None:
 
 
 def plot_score_distribution_by_preprocessor(run: RunEval, outdir: Path) -> None:
-    grouped = _group_details_by_preprocessor(run.details)
-    keys = sorted(grouped.keys())
-    bins = ["0", "0.33", "0.66", "1.0"]
-
-    # counts[bin][preproc_index]
-    counts = {b: [] for b in bins}
-    for k in keys:
-        vals = grouped[k]
-        c = {b: 0 for b in bins}
-        for a in vals:
-            c[_bin_score(a)] += 1
-        for b in bins:
-            counts[b].append(c[b])
-
-    fig = plt.figure(figsize=(10, 5))
+    details = run.details_df
+    bins = SCORE_BINS
+
+    # Rows: preprocessors sorted by name, columns: score bins
+    table = pd.crosstab(
+        details["preprocessor"],
+        _bin_scores(details["accuracy"].to_numpy()),
+    ).reindex(columns=bins, fill_value=0)
+    keys = table.index.tolist()
+
+    # counts_mat[i] is the row for bins[i]; each stack starts where the previous bins end
+    counts_mat = table.to_numpy(dtype=np.int64).T
+    bottoms = np.vstack([np.zeros((1, len(keys)), dtype=np.int64), np.cumsum(counts_mat[:-1], axis=0)])
+
+    fig = Figure(figsize=(10, 5))
     ax = fig.add_subplot(111)
 
-    bottom = [0] * len(keys)
-    for b in bins:
-        ax.bar(keys, counts[b], bottom=bottom, label=b)
-        bottom = [bottom[i] + counts[b][i] for i in range(len(keys))]
+    for i, b in enumerate(bins):
+        ax.bar(keys, counts_mat[i], bottom=bottoms[i], label=b)
 
     ax.set_title(f"Discrete score distribution per preprocessor ({run.run_name})")
     ax.set_ylabel("Count")
@@ -218,8 +271,8 @@ def plot_score_distribution_by_preprocessor(run: RunEval, outdir: Path) -> None:
 
 
 def plot_accuracy_histogram_overall(run: RunEval, outdir: Path) -> None:
-    vals = [d.accuracy for d in run.details]
-    fig = plt.figure(figsize=(8, 5))
+    vals = run.details_df["accuracy"].to_numpy()
+    fig = Figure(figsize=(8, 5))
     ax = fig.add_subplot(111)
     ax.hist(vals, bins=[-0.01, 0.17, 0.5, 0.83, 1.01])  # roughly separates 0, 0.33, 0.66, 1.0
     ax.set_title(f"Overall per-sample accuracy histogram ({run.run_name})")
@@ -239,7 +292,7 @@ def plot_run_comparison_overall_accuracy(runs: List[RunEval], outdir: Path) -> N
     labels = [r.run_name for r in runs_sorted]
     accs = [r.overall_accuracy for r in runs_sorted]
 
-    fig = plt.figure(figsize=(max(8, 0.45 * len(labels)), 5))
+    fig = Figure(figsize=(max(8, 0.45 * len(labels)), 5))
     ax = fig.add_subplot(111)
     ax.bar(labels, accs)
     ax.set_title("Overall accuracy per run")
@@ -256,7 +309,7 @@ def plot_run_comparison_per_preprocessor(runs: List[RunEval], outdir: Path) -> N
     runs_sorted = sorted(runs, key=lambda r: r.run_name)
 
     # For each preprocessor, make a line plot across runs
-    fig = plt.figure(figsize=(10, 6))
+    fig = Figure(figsize=(10, 6))
     ax = fig.add_subplot(111)
 
     x = list(range(len(runs_sorted)))
@@ -309,8 +362,13 @@ def main() -> int:
     outdir = Path(args.outdir)
     _ensure_outdir(outdir)
 
-    paths = sorted(Path().glob(args.input)) if any(ch in args.input for ch in ["*", "?", "["]) else [Path(args.input)]
-    paths = [p for p in paths if p.exists()]
+    if any(ch in args.input for ch in "*?["):
+        # Glob only yields paths that exist, no extra stat per match
+        paths = sorted(Path(".").glob(args.input))
+    else:
+        # Literal path (the default): skip the pattern walker entirely
+        single = Path(args.input)
+        paths = [single] if single.is_file() else []
 
     if not paths:
         print(f"Error: no files found for input={args.input}", file=sys.stderr)
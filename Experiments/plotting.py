@@ -1,9 +1,35 @@
+import importlib.util
 import json
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib import cbook, rcParams
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+# Shared best-effort pickle caches. The scripts are run directly from different folders,
+# so each loads Experiments/pickle_cache.py by file path rather than through sys.path.
+_spec = importlib.util.spec_from_file_location("pickle_cache", Path(__file__).resolve().parent / "pickle_cache.py")
+pickle_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pickle_cache)
+
+# Optional faster JSON parser; falls back to the stdlib json module without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Multithreaded pyarrow CSV reader when available, pandas' C parser otherwise
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = pa_csv = None
 
 # Models to process (latest run per model)
 TARGET_MODELS = [
@@ -16,6 +42,28 @@ TARGET_MODELS = [
     # "gpt-4.1-mini-2025-04-14",
 ]
 
+# Latency columns of metrics.csv, parsed as floats so the plots need no coercion
+METRICS_FLOAT_COLUMNS = [
+    "end_to_end_ms",
+    "send_to_response_created_ms",
+    "response_created_to_first_token_ms",
+    "first_token_to_done_ms",
+]
+
+# PNG encoder settings for every saved plot: light zlib compression, which is much
+# faster to write and only makes the files somewhat larger
+PNG_SAVE_OPTIONS = {"compress_level": 1}
+
+# Parsed per-experiment metrics are cached here; only changed experiments are parsed again
+CACHE_FILE = Path("_cache") / "plotting_metrics.pkl"
+
+
+def _read_json(path: Path):
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 
 def load_vqa_eval_details_for_experiment(exp_dir: Path) -> pd.DataFrame:
     """
@@ -27,20 +75,14 @@ def load_vqa_eval_details_for_experiment(exp_dir: Path) -> pd.DataFrame:
         print(f"Warning: vqa_eval.json not found in {exp_dir}. Skipping accuracy merge.")
         return pd.DataFrame(columns=["sample_id", "preprocessor", "accuracy_official_vqa"])
 
-    obj = json.loads(path.read_text(encoding="utf-8"))
+    obj = _read_json(path)
     details = obj.get("details", [])
 
-    rows = []
-    for r in details:
-        rows.append(
-            {
-                "sample_id": str(r.get("sample_id", "")),
-                "preprocessor": str(r.get("preprocessor", "UNKNOWN")),
-                "accuracy_official_vqa": float(r.get("accuracy_official_vqa", 0.0)),
-            }
-        )
-
-    return pd.DataFrame(rows)
+    # Build the frame from the records in one go; keys missing from a record come back as NaN
+    cols = ["sample_id", "preprocessor", "accuracy_official_vqa"]
+    df = pd.json_normalize(details, max_level=0).reindex(columns=cols)
+    df = df.fillna({"sample_id": "", "preprocessor": "UNKNOWN", "accuracy_official_vqa": 0.0})
+    return df.astype({"sample_id": str, "preprocessor": str, "accuracy_official_vqa": "float64"})
 
 
 def _pick_first_existing(df: pd.DataFrame, candidates: list[str]) -> str | None:
@@ -50,17 +92,92 @@ def _pick_first_existing(df: pd.DataFrame, candidates: list[str]) -> str | None:
     return None
 
 
+def _numeric(s: pd.Series) -> pd.Series:
+    """
+    Columns parsed from the CSVs are already numeric; only coerce the ones
+    that were read as text (e.g. because of stray non-numeric cells).
+    """
+    if pd.api.types.is_numeric_dtype(s):
+        return s
+    return pd.to_numeric(s, errors="coerce")
+
+
+# Columns _compute_roi_coverage_pct derives the coverage from
+ROI_COVERAGE_COLUMNS = ["processed_pixels_total", "original_pixels_w", "original_pixels_h"]
+
+
 def _compute_roi_coverage_pct(df: pd.DataFrame) -> pd.Series | None:
 
     # 3) NEW: processed pixel fraction (proxy for "coverage")
-    if all(c in df.columns for c in ["processed_pixels_total", "original_pixels_w", "original_pixels_h"]):
-        proc = pd.to_numeric(df["processed_pixels_total"], errors="coerce")
-        ow = pd.to_numeric(df["original_pixels_w"], errors="coerce")
-        oh = pd.to_numeric(df["original_pixels_h"], errors="coerce")
-        orig = ow * oh
-        with np.errstate(divide="ignore", invalid="ignore"):
-            return (proc / orig) * 100.0
+    if all(c in df.columns for c in ROI_COVERAGE_COLUMNS):
+        # Plain float arrays and one in-place divide; rows without a positive original
+        # area (or with missing values) come out as NaN
+        proc = _numeric(df["processed_pixels_total"]).to_numpy(dtype=np.float64, na_value=np.nan)
+        orig = _numeric(df["original_pixels_w"]).to_numpy(dtype=np.float64, na_value=np.nan)
+        orig *= _numeric(df["original_pixels_h"]).to_numpy(dtype=np.float64, na_value=np.nan)
+        out = np.full_like(proc, np.nan)
+        np.divide(proc, orig, out=out, where=orig > 0)
+        out *= 100.0
+        return pd.Series(out, index=df.index, name="roi_coverage_pct")
+
+
 
+# Upper bound on plotted markers per group in the scatter plots
+MAX_SCATTER_POINTS_PER_GROUP = 2000
+
+
+def _scatter_by_group(ax, x, y, groups: pd.Series) -> list[Line2D]:
+    """
+    Draw all points with a single scatter call, coloured per group the same way
+    one scatter call per group would be. Groups larger than MAX_SCATTER_POINTS_PER_GROUP
+    are randomly subsampled (trend lines are fitted on the full data separately).
+    Returns one legend handle per group.
+    """
+    codes, uniques = pd.factorize(groups, sort=True, use_na_sentinel=False)
+    palette = rcParams["axes.prop_cycle"].by_key()["color"]
+    colors = [palette[i % len(palette)] for i in range(len(uniques))]
+
+    x = np.asarray(x)
+    y = np.asarray(y)
+
+    # Beyond a few thousand points per group the cloud looks the same but every marker
+    # still costs draw time, so large groups are thinned to a fixed random subset
+    counts = np.bincount(codes, minlength=len(uniques))
+    if counts.max(initial=0) > MAX_SCATTER_POINTS_PER_GROUP:
+        rng = np.random.default_rng(0)
+        keep = np.ones(codes.size, dtype=bool)
+        for code in np.flatnonzero(counts > MAX_SCATTER_POINTS_PER_GROUP):
+            members = np.flatnonzero(codes == code)
+            keep[members] = False
+            keep[rng.choice(members, MAX_SCATTER_POINTS_PER_GROUP, replace=False)] = True
+        x, y, codes = x[keep], y[keep], codes[keep]
+
+    ax.scatter(x, y, c=np.take(colors, codes), s=10, alpha=0.6)
+
+    return [
+        Line2D([], [], linestyle="", marker="o", markersize=np.sqrt(10), alpha=0.6, color=color, label=str(label))
+        for color, label in zip(colors, uniques)
+    ]
+
+
+def _plot_trend_line(ax, x: np.ndarray, y: np.ndarray) -> None:
+    """
+    Least-squares line through the finite (x, y) points, drawn between min(x) and max(x).
+    """
+    msk = np.isfinite(x) & np.isfinite(y)
+    x = x[msk]
+    y = y[msk]
+    if len(x) < 2 or np.std(x) == 0:
+        return
+
+    A = np.empty((x.size, 2))
+    A[:, 0] = x
+    A[:, 1] = 1.0
+    m, b = np.linalg.lstsq(A, y, rcond=None)[0]
+
+    # A straight line only needs its two endpoints
+    x_line = np.array([x.min(), x.max()])
+    ax.plot(x_line, m * x_line + b, linewidth=2)
 
 
 def _plot_roi_coverage_vs_accuracy(
@@ -81,33 +198,26 @@ def _plot_roi_coverage_vs_accuracy(
         print("Skipping ROI-coverage-vs-accuracy plot: could not compute ROI coverage from available columns.")
         return
 
-    d = df.copy()
-    d["roi_coverage_pct"] = cov
-    d["roi_coverage_pct"] = pd.to_numeric(d["roi_coverage_pct"], errors="coerce")
-    d["accuracy_official_vqa"] = pd.to_numeric(d["accuracy_official_vqa"], errors="coerce")
+    # Only the three columns the plot reads, rather than a copy of the whole merged frame
+    d = pd.DataFrame({
+        "roi_coverage_pct": cov,
+        "accuracy_official_vqa": _numeric(df["accuracy_official_vqa"]),
+        group_by: df[group_by],
+    })
     d = d.dropna(subset=["roi_coverage_pct", "accuracy_official_vqa"])
 
     if d.empty:
         print("Skipping ROI-coverage-vs-accuracy plot: no valid numeric rows after cleaning.")
         return
 
-    fig, ax = plt.subplots(figsize=(8, 5))
+    fig = Figure(figsize=(8, 5), layout="constrained")
+    ax = fig.subplots()
 
     # Scatter by group
-    for label, sub in d.groupby(group_by, dropna=False):
-        ax.scatter(sub["roi_coverage_pct"], sub["accuracy_official_vqa"], s=10, alpha=0.6, label=str(label))
+    handles = _scatter_by_group(ax, d["roi_coverage_pct"], d["accuracy_official_vqa"], d[group_by])
 
     # Global trend line
-    x = d["roi_coverage_pct"].to_numpy()
-    y = d["accuracy_official_vqa"].to_numpy()
-    msk = np.isfinite(x) & np.isfinite(y)
-    x = x[msk]
-    y = y[msk]
-    if len(x) >= 2 and np.nanstd(x) > 0:
-        m, b = np.polyfit(x, y, 1)
-        x_line = np.linspace(x.min(), x.max(), 100)
-        y_line = m * x_line + b
-        ax.plot(x_line, y_line, linewidth=2)
+    _plot_trend_line(ax, d["roi_coverage_pct"].to_numpy(), d["accuracy_official_vqa"].to_numpy())
 
     ax.set_title("ROI coverage vs VQA accuracy")
     ax.set_xlabel("ROI coverage (% of full image)")
@@ -115,140 +225,300 @@ def _plot_roi_coverage_vs_accuracy(
     ax.set_ylim(0, 1.05)
 
     if d[group_by].nunique() <= 12:
-        ax.legend(fontsize=8, loc="best")
+        ax.legend(handles=handles, fontsize=8, loc="best")
 
     sample_info = _compute_sample_info(d, group_by)
     fig.suptitle(f"{title_prefix}ROI coverage vs accuracy\n{sample_info}".strip(), fontsize=11)
 
-    plt.tight_layout()
-
     if save_dir:
-        fig.savefig(save_dir / "roi_coverage_vs_accuracy.png", dpi=200)
+        fig.savefig(save_dir / "roi_coverage_vs_accuracy.png", dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
 
-    plt.close(fig)
+
+PAYLOAD_BYTES_COLUMNS = [
+    # Most realistic network payload first
+    "data_url_bytes_utf8_total",      # actual string sent
+    "processed_binary_bytes",         # compressed binary
+    "original_binary_bytes",
+]
 
 
 def _pick_payload_bytes_column(df: pd.DataFrame) -> str | None:
-    candidates = [
-        # Most realistic network payload first
-        "data_url_bytes_utf8_total",      # actual string sent
-        "processed_binary_bytes",         # compressed binary
-        "original_binary_bytes",
-    ]
-    for c in candidates:
-        if c in df.columns:
+    columns = set(df.columns)
+    for c in PAYLOAD_BYTES_COLUMNS:
+        if c in columns:
             return c
     return None
 
-import re
-
-def _coco_image_id_to_sample_id(image_id: str) -> str:
-    """
-    Converts: COCO_val2014_000000000338.jpg -> 338002
-    If the pattern does not match, returns the original string (so you can see failures).
-    """
-    m = re.search(r"COCO_(?:val|train)2014_(\d+)\.jpg$", str(image_id))
-    if not m:
-        return str(image_id)
-
-    coco_num = int(m.group(1))  # 000000000338 -> 338
-    return f"{coco_num}002"
+# COCO file name -> image number; leading zeros are left out of the group. The sample_id
+# in metrics.csv is that number with "002" appended: COCO_val2014_000000000338.jpg -> 338002
+COCO_IMAGE_ID_PATTERN = re.compile(r"COCO_(?:val|train)2014_0*(\d+)\.jpg$")
 
 
 def load_latest_preprocessing_sizes(preproc_root: str) -> pd.DataFrame:
     root = Path(preproc_root)
 
-    files = sorted(root.glob("PreprocessingSizes_*.csv"))
-    if not files:
+    # The names end in a sortable timestamp, so the latest file is the max name (single pass, no sort)
+    latest = None
+    if root.is_dir():
+        with os.scandir(root) as it:
+            latest = max(
+                (e for e in it if e.name.startswith("PreprocessingSizes_") and e.name.endswith(".csv")),
+                key=lambda e: e.name,
+                default=None,
+            )
+    if latest is None:
         raise RuntimeError(f"No PreprocessingSizes_*.csv found in {root}")
 
-    latest = files[-1]
     print(f"Using preprocessing sizes file: {latest.name}")
 
-    df = pd.read_csv(latest)
+    # Same reader as the metrics files: Arrow parses with the key columns typed as strings up front
+    if pa_csv is not None:
+        convert = pa_csv.ConvertOptions(column_types={"image_id": pa.string(), "technique": pa.string()})
+        df = pa_csv.read_csv(latest.path, convert_options=convert).to_pandas()
+    else:
+        df = pd.read_csv(latest.path, dtype={"image_id": str, "technique": str})
 
-    df["image_id"] = df["image_id"].astype(str)
-    df["technique"] = df["technique"].astype(str)
+    # Only a handful of techniques, repeated for every image; matches the categorical
+    # preprocessor column of the metrics frame it is merged with
+    df["technique"] = df["technique"].astype("category")
 
-    # Create sample_id to match metrics.csv
-    df["sample_id"] = df["image_id"].map(_coco_image_id_to_sample_id)
+    # Create sample_id to match metrics.csv (see COCO_IMAGE_ID_PATTERN) in one vectorized
+    # regex pass; image_ids that do not match are kept as is, so failures stay visible
+    coco_num = df["image_id"].str.extract(COCO_IMAGE_ID_PATTERN, expand=False)
+    matched = coco_num.notna()
+    df["sample_id"] = (coco_num + "002").where(matched, df["image_id"])
 
     # Debug: show how many conversions worked
-    bad = df["sample_id"].eq(df["image_id"]).mean() * 100
+    bad = (~matched).mean() * 100
     if bad > 0:
         print(f"Warning: {bad:.1f}% of image_id values did not match expected COCO pattern.")
 
-    df["sample_id"] = df["sample_id"].astype(str)
-
     return df
 
 
 
-def load_all_metrics(log_root: str = "logs") -> pd.DataFrame:
+def _experiment_dirs(log_root: Path) -> list[Path]:
     """
-    Walk through the logs folder and collect all metrics.csv files.
-    For each experiment, also read config.json and attach metadata columns.
+    Experiment folders under log_root that contain both metrics.csv and config.json.
     """
-    log_root = Path(log_root)
-    all_rows = []
+    # scandir reports the entry type from the directory listing, so only real
+    # folders cost the two extra existence checks
+    with os.scandir(log_root) as it:
+        names = [e.name for e in it if e.is_dir()]
+    return [
+        log_root / name for name in sorted(names)
+        if os.path.exists(log_root / name / "metrics.csv") and os.path.exists(log_root / name / "config.json")
+    ]
 
-    for exp_dir in log_root.iterdir():
-        if not exp_dir.is_dir():
-            continue
 
-        metrics_path = exp_dir / "metrics.csv"
-        config_path = exp_dir / "config.json"
+def _cache_key(exp_dirs: list[Path]) -> list[tuple[str, int, int]]:
+    """
+    (folder name, metrics.csv mtime, config.json mtime) for every experiment.
+    Any added, removed or rewritten experiment changes the key.
+    """
+    return [
+        (d.name, (d / "metrics.csv").stat().st_mtime_ns, (d / "config.json").stat().st_mtime_ns)
+        for d in exp_dirs
+    ]
 
-        if not metrics_path.exists() or not config_path.exists():
-            continue
 
-        with open(config_path, "r", encoding="utf-8") as f:
-            cfg = json.load(f)
+def _load_experiment_metrics(
+    exp_dir: Path,
+    models: frozenset[str] | None = None,
+) -> tuple["pa.Table | pd.DataFrame | None", dict]:
+    """
+    Read one experiment's metrics.csv (as an Arrow table when pyarrow is available)
+    and the metadata from its config.json.
 
-        df = pd.read_csv(metrics_path)
+    config.json is read first; if models is given and the run's model is not in it,
+    metrics.csv is not parsed at all and None is returned in place of the table.
+    """
+    cfg = _read_json(exp_dir / "config.json")
+    meta = {
+        "experiment_id": cfg.get("experiment_id", exp_dir.name),
+        "model": cfg.get("model", "unknown"),
+        "dataset_name": cfg.get("dataset_name", "unknown"),
+        "timestamp": cfg.get("timestamp"),
+    }
+    if models is not None and meta["model"] not in models:
+        return None, meta
+
+    # Read the join keys as strings at parse time so they line up with the sizes table
+    metrics_path = exp_dir / "metrics.csv"
+    if pa_csv is not None:
+        column_types = {"sample_id": pa.string(), "preprocessor": pa.string()}
+        column_types.update({c: pa.float64() for c in METRICS_FLOAT_COLUMNS})
+        convert = pa_csv.ConvertOptions(column_types=column_types)
+        table = pa_csv.read_csv(metrics_path, convert_options=convert)
+        if "preprocessor" not in table.column_names:
+            table = table.append_column("preprocessor", pa.array(["Unknown"] * table.num_rows, pa.string()))
+        return table, meta
+
+    dtype = {"sample_id": str, "preprocessor": str}
+    dtype.update(dict.fromkeys(METRICS_FLOAT_COLUMNS, "float64"))
+    df = pd.read_csv(metrics_path, dtype=dtype)
+    if "preprocessor" not in df.columns:
+        df["preprocessor"] = "Unknown"
+    return df, meta
+
+
+def _assemble_metrics(loaded: list[tuple["pa.Table | pd.DataFrame", dict]]) -> pd.DataFrame:
+    """
+    Combine the per-experiment parts from _load_experiment_metrics into one frame
+    with the experiment metadata attached as columns.
+    """
+    parts = [part for part, _ in loaded]
+    if pa_csv is not None:
+        # Arrow concatenation only appends chunk references; the data is converted
+        # to pandas once for the whole table instead of per file plus a pd.concat copy
+        lengths = [table.num_rows for table in parts]
+        df_all = pa.concat_tables(parts, promote_options="permissive").to_pandas(split_blocks=True)
+    else:
+        lengths = [len(df) for df in parts]
+        df_all = pd.concat(parts, ignore_index=True)
 
-        if "preprocessor" not in df.columns:
-            df["preprocessor"] = "Unknown"
+    # Metadata is constant per experiment, so attach it after the concat as
+    # categorical codes instead of broadcasting strings into every part
+    for col in ("experiment_id", "model", "dataset_name"):
+        codes, uniques = pd.factorize(pd.Series([meta[col] for _, meta in loaded]))
+        df_all[col] = pd.Categorical.from_codes(np.repeat(codes, lengths), categories=uniques)
 
-        df["experiment_id"] = cfg.get("experiment_id", exp_dir.name)
-        df["model"] = cfg.get("model", "unknown")
-        df["dataset_name"] = cfg.get("dataset_name", "unknown")
-        df["timestamp"] = cfg.get("timestamp")
+    # These label columns repeat a handful of values; as categoricals every later filter,
+    # groupby and merge on them works on integer codes and the cached frame shrinks
+    for col in ("preprocessor", "sample_id"):
+        df_all[col] = df_all[col].astype("category")
 
-        all_rows.append(df)
+    # Parse the one timestamp per experiment, then broadcast the parsed values to the rows
+    timestamps = pd.to_datetime(pd.Index([meta["timestamp"] for _, meta in loaded]), errors="coerce")
+    df_all["timestamp"] = timestamps.take(np.repeat(np.arange(len(loaded)), lengths))
+
+    return df_all
 
-    if not all_rows:
-        raise RuntimeError(f"No metrics.csv files found in {log_root.resolve()}")
 
-    df_all = pd.concat(all_rows, ignore_index=True)
+def load_all_metrics(
+    log_root: str = "logs",
+    force_reload: bool = False,
+    models: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Walk through the logs folder and collect all metrics.csv files.
+    For each experiment, also read config.json and attach metadata columns.
 
-    if "timestamp" in df_all.columns:
-        df_all["timestamp"] = pd.to_datetime(df_all["timestamp"], errors="coerce")
+    If models is given, only experiments whose config.json names one of those
+    models are loaded; the metrics.csv of every other run is never parsed.
 
-    return df_all
+    The parsed per-experiment parts are pickled to logs/_cache/ and the combined
+    frame is assembled from them; only new or rewritten experiments (metrics.csv
+    or config.json changed) are parsed again. Pass force_reload=True to ignore the
+    cache and parse everything.
+    """
+    log_root = Path(log_root)
+    exp_dirs = _experiment_dirs(log_root)
+    key = _cache_key(exp_dirs)
+    models = frozenset(models) if models is not None else None
+    cache_path = log_root / CACHE_FILE
+
+    cached = {}
+    if not force_reload:
+        cached = pickle_cache.read_cache(cache_path) or {}
+
+    # Parts whose files still have the same mtimes are reused from the cache. A run that
+    # was skipped by an earlier model filter has no table and is read again if now wanted.
+    cached_parts = cached.get("parts", {})
+    loaded = [None] * len(exp_dirs)
+    stale = []
+    for i, stamp in enumerate(key):
+        hit = cached_parts.get(stamp[0])
+        if hit is not None and hit[0] == stamp and (
+            hit[1][0] is not None or (models is not None and hit[1][1]["model"] not in models)
+        ):
+            loaded[i] = hit[1]
+        else:
+            stale.append(i)
+
+    # Experiments are independent and CSV parsing releases the GIL, so read them concurrently.
+    # ex.map keeps the results in directory order.
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+        results = ex.map(_load_experiment_metrics, [exp_dirs[i] for i in stale], [models] * len(stale))
+        for i, result in zip(stale, results):
+            loaded[i] = result
+
+    selected = [
+        (part, meta) for part, meta in loaded
+        if part is not None and (models is None or meta["model"] in models)
+    ]
+    if not selected:
+        raise RuntimeError(f"No metrics.csv files found in {log_root.resolve()}")
+
+    # Only the parts are cached: the combined frame would store every experiment a second time
+    if stale:
+        parts = {stamp[0]: (stamp, result) for stamp, result in zip(key, loaded)}
+        pickle_cache.write_cache(cache_path, {"parts": parts})
 
+    return _assemble_metrics(selected)
 
-def select_latest_run_for_model(df: pd.DataFrame, target_model: str) -> pd.DataFrame:
+
+def latest_experiment_per_model(df: pd.DataFrame) -> dict[str, str]:
+    """
+    Map every model to the experiment_id of its latest run, using a single
+    groupby over the whole frame instead of one pass per model.
+    """
+    if "timestamp" not in df.columns:
+        # No timestamps at all: the ids start with the run's date, so take the largest one
+        return {
+            model: max(exp_ids.tolist())
+            for model, exp_ids in df.groupby("model", sort=False, observed=True)["experiment_id"]
+        }
+
+    # For each experiment, take its max timestamp, then choose the latest one per model
+    exp_times = df.groupby(["model", "experiment_id"], sort=False, observed=True)["timestamp"].max()
+
+    latest = {}
+    for model, times in exp_times.groupby(level="model", sort=False, observed=True):
+        times = times.droplevel("model")
+        if times.isna().all():
+            # No usable timestamps: the ids start with the run's date, so take the largest one
+            latest[model] = max(times.index)
+        else:
+            latest[model] = times.idxmax()
+    return latest
+
+
+def select_latest_run_for_model(
+    df: pd.DataFrame,
+    target_model: str,
+    latest_exp_ids: dict[str, str] | None = None,
+) -> pd.DataFrame:
     """
     Filter to a single model and return only the latest experiment_id
     based on the timestamp column.
+
+    Pass the result of latest_experiment_per_model() as latest_exp_ids when
+    selecting several models from the same frame.
     """
-    df_model = df[df["model"] == target_model].copy()
-    if df_model.empty:
-        raise RuntimeError(f"No runs found for model {target_model!r}")
+    if latest_exp_ids is None:
+        latest_exp_ids = latest_experiment_per_model(df)
 
-    if "timestamp" not in df_model.columns or df_model["timestamp"].isna().all():
-        latest_exp_id = df_model["experiment_id"].iloc[-1]
-    else:
-        exp_times = df_model.groupby("experiment_id")["timestamp"].max()
-        latest_exp_id = exp_times.idxmax()
+    latest_exp_id = latest_exp_ids.get(target_model)
+    if latest_exp_id is None:
+        raise RuntimeError(f"No runs found for model {target_model!r}")
 
-    df_latest = df_model[df_model["experiment_id"] == latest_exp_id].copy()
+    # Boolean indexing already returns a new frame and callers never write into it
+    df_latest = df[df["experiment_id"] == latest_exp_id]
     print(f"Using latest run for model {target_model!r}: experiment_id = {latest_exp_id}")
     return df_latest
 
 
+# ASCII characters that are not alphanumeric or one of "-_." map to "_"
+_SAFE_FILENAME_TABLE = str.maketrans(
+    {chr(i): "_" for i in range(128) if not (chr(i).isalnum() or chr(i) in "-_.")}
+)
+
+
 def _safe_filename(name: str) -> str:
+    if name.isascii():
+        return name.translate(_SAFE_FILENAME_TABLE)
+    # Keep non-ASCII letters and digits exactly as before
     return "".join(c if c.isalnum() or c in ("-", "_", ".") else "_" for c in name)
 
 
@@ -258,8 +528,14 @@ def _compute_sample_info(df: pd.DataFrame, group_by: str) -> str:
     'Samples per technique: X'
     where X is the average number of samples per preprocessing technique.
     """
-    counts = df[group_by].astype(str).value_counts(dropna=False)
+    # Callers pass group_by already cast to str, so count it directly
+    return _format_sample_info(df[group_by].value_counts(dropna=False))
 
+
+def _format_sample_info(counts: pd.Series) -> str:
+    """
+    Same text as _compute_sample_info, from group sizes that were already counted.
+    """
     if counts.empty:
         return "Samples per technique: 0"
 
@@ -272,41 +548,39 @@ def _plot_payload_vs_latency(
     group_by: str,
     save_dir: Path | None,
     title_prefix: str,
+    sample_info: str | None = None,
+    bytes_col: str | None = None,
 ) -> None:
     """
     Scatter plot: payload bytes vs end_to_end_ms, with a simple linear trend line.
+    Pass sample_info and bytes_col when they were already resolved for df.
     """
     if "end_to_end_ms" not in df.columns:
         return
 
-    bytes_col = _pick_payload_bytes_column(df)
+    if bytes_col is None:
+        bytes_col = _pick_payload_bytes_column(df)
     if bytes_col is None:
         print("Skipping payload-vs-latency plot: no payload-bytes column found.")
         return
 
     d = df[[bytes_col, "end_to_end_ms", group_by]].copy()
-    d[bytes_col] = pd.to_numeric(d[bytes_col], errors="coerce")
-    d["end_to_end_ms"] = pd.to_numeric(d["end_to_end_ms"], errors="coerce")
+    d[bytes_col] = _numeric(d[bytes_col])
+    d["end_to_end_ms"] = _numeric(d["end_to_end_ms"])
     d = d.dropna(subset=[bytes_col, "end_to_end_ms"])
 
     if d.empty:
         print("Skipping payload-vs-latency plot: no valid numeric rows.")
         return
 
-    fig, ax = plt.subplots(figsize=(8, 5))
+    fig = Figure(figsize=(8, 5), layout="constrained")
+    ax = fig.subplots()
 
     # Scatter by group (label only once per group)
-    for label, sub in d.groupby(group_by, dropna=False):
-        ax.scatter(sub[bytes_col], sub["end_to_end_ms"], s=10, alpha=0.6, label=str(label))
+    handles = _scatter_by_group(ax, d[bytes_col], d["end_to_end_ms"], d[group_by])
 
     # Linear trend line on all points (for a quick relationship view)
-    x = d[bytes_col].to_numpy()
-    y = d["end_to_end_ms"].to_numpy()
-    if len(x) >= 2 and np.nanstd(x) > 0:
-        m, b = np.polyfit(x, y, 1)
-        x_line = np.linspace(x.min(), x.max(), 100)
-        y_line = m * x_line + b
-        ax.plot(x_line, y_line, linewidth=2)
+    _plot_trend_line(ax, d[bytes_col].to_numpy(), d["end_to_end_ms"].to_numpy())
 
     ax.set_title(f"Network payload size vs observed end-to-end latency")
     ax.set_xlabel(f"{bytes_col} (bytes)")
@@ -314,17 +588,76 @@ def _plot_payload_vs_latency(
 
     # Avoid huge legends if you have many preprocessors; still useful if you have a few.
     if d[group_by].nunique() <= 12:
-        ax.legend(fontsize=8, loc="best")
+        ax.legend(handles=handles, fontsize=8, loc="best")
 
-    sample_info = _compute_sample_info(df, group_by)
+    if sample_info is None:
+        sample_info = _compute_sample_info(df, group_by)
     fig.suptitle(f"{title_prefix}Payload vs latency\n{sample_info}".strip(), fontsize=11)
 
-    plt.tight_layout()
-
     if save_dir:
-        fig.savefig(save_dir / "payload_vs_end_to_end_ms.png", dpi=200)
+        fig.savefig(save_dir / "payload_vs_end_to_end_ms.png", dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
+
 
-    plt.close(fig)
+def _boxplot_stats(df: pd.DataFrame, group_by: str, cols: list[str]) -> dict[str, list[dict]]:
+    """
+    Box and whisker statistics for every column in cols, grouped by group_by.
+    Groups the frame once for all columns and returns {column: [stats per group]}
+    ready for Axes.bxp (same whiskers and fliers as DataFrame.boxplot).
+    """
+    # Integer group codes (sorted like groupby, missing labels -> -1) and one stable
+    # argsort, so every group is a contiguous slice of each column's numpy array
+    codes, uniques = pd.factorize(df[group_by], sort=True)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+    stats = {}
+    for col in cols:
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)[order]
+        stats[col] = []
+        for i, label in enumerate(uniques):
+            group = values[bounds[i]:bounds[i + 1]]
+            group = group[~np.isnan(group)]
+            stats[col].extend(cbook.boxplot_stats(group, labels=[str(label)]))
+    return stats
+
+
+# Each worker process draws all of its boxplots on one figure, cleared in between
+_BOXPLOT_FIGURE: Figure | None = None
+
+
+def _boxplot_figure() -> Figure:
+    global _BOXPLOT_FIGURE
+    if _BOXPLOT_FIGURE is None:
+        _BOXPLOT_FIGURE = Figure(figsize=(7, 5), layout="constrained")
+    else:
+        _BOXPLOT_FIGURE.clear()
+    return _BOXPLOT_FIGURE
+
+
+def _render_boxplot(
+    stats: list[dict],
+    title: str,
+    xlabel: str,
+    ylabel: str,
+    suptitle: str,
+    save_path: Path | None,
+) -> None:
+    """
+    Draw one boxplot from precomputed bxp statistics and save it.
+    Runs in a worker process, so it uses a bare Figure instead of going through pyplot.
+    """
+    fig = _boxplot_figure()
+    ax = fig.subplots()
+    ax.bxp(stats)
+    ax.grid(True)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.tick_params(axis="x", rotation=60)
+    fig.suptitle(suptitle, fontsize=11)
+
+    if save_path:
+        fig.savefig(save_path, dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
 
 
 def plot_boxplots_separate_images(
@@ -332,6 +665,7 @@ def plot_boxplots_separate_images(
     group_by: str,
     save_dir: Path | None = None,
     title_prefix: str = "",
+    executor: Executor | None = None,
 ) -> None:
     """
     Create boxplots and save each metric as its own image:
@@ -342,6 +676,9 @@ def plot_boxplots_separate_images(
     Also adds:
     - bar chart of average end_to_end_ms per preprocessing technique
     - scatter: network payload size vs end_to_end_ms
+
+    The boxplots are rendered on executor (a process pool) when given, so callers
+    plotting several frames can share one pool; otherwise a pool is started here.
     """
     latency_cols = [
         "end_to_end_ms",
@@ -367,32 +704,40 @@ def plot_boxplots_separate_images(
             f"group_by column {group_by!r} not in dataframe columns: {list(df.columns)}"
         )
 
-    df = df.copy()
-    df[group_by] = df[group_by].astype(str)
+    # Resolved once here and handed to the payload plot
+    bytes_col = _pick_payload_bytes_column(df)
+
+    # Keep only the columns some plot reads; merged frames carry many unused size/ROI columns.
+    # assign replaces the label column on the narrowed frame instead of copying and then mutating it.
+    needed = set(
+        latency_cols + token_cols + [cost_col, group_by, "accuracy_official_vqa"]
+        + ([bytes_col] if bytes_col else []) + ROI_COVERAGE_COLUMNS
+    )
+    df = df[[c for c in df.columns if c in needed]].assign(**{group_by: df[group_by].astype(str)})
 
     if save_dir:
         save_dir.mkdir(parents=True, exist_ok=True)
 
+    # One groupby for every plotted column instead of one per DataFrame.boxplot call
+    stats = _boxplot_stats(df, group_by, latency_cols + token_cols + ([cost_col] if has_cost else []))
+
+    # Each boxplot is an independent (stats, labels, path) task that is rendered in a
+    # worker process; the remaining plots are drawn here in the meantime.
+    tasks = []
+
+    # The group sizes do not depend on the metric, so count them once
+    group_counts = df[group_by].value_counts(dropna=False)
+    sample_info = _format_sample_info(group_counts)
+
     # -----------------
     # Latency: one fig per metric
     # -----------------
     for col in latency_cols:
-        fig, ax = plt.subplots(figsize=(7, 5))
-        df.boxplot(column=col, by=group_by, ax=ax)
-        ax.set_title(col)
-        ax.set_xlabel(group_by)
-        ax.set_ylabel("milliseconds")
-        ax.tick_params(axis="x", rotation=60)
-
-        sample_info = _compute_sample_info(df, group_by)
-        fig.suptitle(f"{title_prefix}{col} boxplot\n{sample_info}".strip(), fontsize=11)
-
-        plt.tight_layout()
-
-        if save_dir:
-            fig.savefig(save_dir / f"latency_boxplot_{_safe_filename(col)}.png", dpi=200)
-
-        plt.close(fig)
+        tasks.append((
+            stats[col], col, group_by, "milliseconds",
+            f"{title_prefix}{col} boxplot\n{sample_info}".strip(),
+            save_dir / f"latency_boxplot_{_safe_filename(col)}.png" if save_dir else None,
+        ))
 
     # -----------------
     # Tokens: one fig per metric
@@ -401,47 +746,51 @@ def plot_boxplots_separate_images(
     # Exclude specific preprocessors from token plots
     excluded_preprocessors_for_tokens = {"YoloV12SalientRoi+GlobalThumb"}
 
-    df_tokens = df[~df[group_by].isin(excluded_preprocessors_for_tokens)].copy()
+    token_sample_info = _format_sample_info(
+        group_counts.drop(list(excluded_preprocessors_for_tokens), errors="ignore")
+    )
 
     for col in token_cols:
-        fig, ax = plt.subplots(figsize=(7, 5))
-        df_tokens.boxplot(column=col, by=group_by, ax=ax)
-        ax.set_title(col)
-        ax.set_xlabel(group_by)
-        ax.set_ylabel("tokens")
-        ax.tick_params(axis="x", rotation=60)
-
-        sample_info = _compute_sample_info(df_tokens, group_by)
-        fig.suptitle(f"{title_prefix}{col} boxplot\n{sample_info}".strip(), fontsize=11)
-
-        plt.tight_layout()
-
-        if save_dir:
-            fig.savefig(save_dir / f"tokens_boxplot_{_safe_filename(col)}.png", dpi=200)
-
-        plt.close(fig)
+        tasks.append((
+            [st for st in stats[col] if st["label"] not in excluded_preprocessors_for_tokens],
+            col, group_by, "tokens",
+            f"{title_prefix}{col} boxplot\n{token_sample_info}".strip(),
+            save_dir / f"tokens_boxplot_{_safe_filename(col)}.png" if save_dir else None,
+        ))
 
     # -----------------
     # Cost: one fig
     # -----------------
     if has_cost:
-        fig, ax = plt.subplots(figsize=(7, 5))
-        df.boxplot(column=cost_col, by=group_by, ax=ax)
-        ax.set_title("Total cost per call")
-        ax.set_xlabel(group_by)
-        ax.set_ylabel("USD")
-        ax.tick_params(axis="x", rotation=60)
-
-        sample_info = _compute_sample_info(df, group_by)
-        fig.suptitle(f"{title_prefix}Cost boxplot\n{sample_info}".strip(), fontsize=11)
-
-        plt.tight_layout()
-
-        if save_dir:
-            fig.savefig(save_dir / "cost_boxplot.png", dpi=200)
+        tasks.append((
+            stats[cost_col], "Total cost per call", group_by, "USD",
+            f"{title_prefix}Cost boxplot\n{sample_info}".strip(),
+            save_dir / "cost_boxplot.png" if save_dir else None,
+        ))
+
+    if executor is None:
+        pool = ProcessPoolExecutor(max_workers=max(1, min(len(tasks), os.cpu_count() or 1)))
+    else:
+        pool = nullcontext(executor)
+    with pool as ex:
+        futures = [ex.submit(_render_boxplot, *task) for task in tasks]
+        _plot_summary_figures(df, group_by, save_dir, title_prefix, sample_info, bytes_col)
+        for fut in futures:
+            fut.result()
 
-        plt.close(fig)
 
+def _plot_summary_figures(
+    df: pd.DataFrame,
+    group_by: str,
+    save_dir: Path | None,
+    title_prefix: str,
+    sample_info: str,
+    bytes_col: str | None,
+) -> None:
+    """
+    The figures of plot_boxplots_separate_images that are not boxplots:
+    average end_to_end_ms bar chart, payload vs latency and ROI coverage vs accuracy.
+    """
     # -----------------
     # Extra plot: average end_to_end per preprocessing technique
     # -----------------
@@ -453,30 +802,37 @@ def plot_boxplots_separate_images(
         )
 
         print("Average end_to_end_ms per preprocessing technique:")
-        for technique, mean_ms in means.items():
-            print(f"{technique} - {mean_ms:.2f} ms")
+        print("\n".join(f"{technique} - {mean_ms:.2f} ms" for technique, mean_ms in means.items()))
 
-        fig, ax = plt.subplots(figsize=(9, 5))
-        means.plot(kind="bar", ax=ax)
+        # Plain ax.bar on the values; same bar width as pandas' bar plot, without its wrapper
+        vals = means.to_numpy()
+        idx = np.arange(vals.size)
+
+        fig = Figure(figsize=(9, 5), layout="constrained")
+        ax = fig.subplots()
+        ax.bar(idx, vals, width=0.5)
+        ax.set_xticks(idx, means.index.astype(str))
         ax.set_title("Average end_to_end_ms per preprocessing technique")
         ax.set_xlabel(group_by)
         ax.set_ylabel("milliseconds")
         ax.tick_params(axis="x", rotation=60)
 
-        sample_info = _compute_sample_info(df, group_by)
         fig.suptitle(f"{title_prefix}Average end_to_end_ms\n{sample_info}".strip(), fontsize=11)
 
-        plt.tight_layout()
-
         if save_dir:
-            fig.savefig(save_dir / "avg_end_to_end_ms_by_preprocessor.png", dpi=200)
-
-        plt.close(fig)
+            fig.savefig(save_dir / "avg_end_to_end_ms_by_preprocessor.png", dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
 
     # -----------------
     # NEW: payload size vs latency scatter
     # -----------------
-    _plot_payload_vs_latency(df, group_by=group_by, save_dir=save_dir, title_prefix=title_prefix)
+    _plot_payload_vs_latency(
+        df,
+        group_by=group_by,
+        save_dir=save_dir,
+        title_prefix=title_prefix,
+        sample_info=sample_info,
+        bytes_col=bytes_col,
+    )
 
     # -----------------
     # NEW: ROI coverage vs accuracy scatter
@@ -485,64 +841,81 @@ def plot_boxplots_separate_images(
 
 
 
-def plot_preprocessors_for_latest_run_per_model(logs_root: str = "logs") -> None:
+def _with_shared_categories(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    keys: list[str],
+) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
-    For each model in TARGET_MODELS:
-      - pick the latest experiment
-      - plot metrics grouped by preprocessor
-      - save under logs/<experiment_id>/plots_by_preprocessor/
+    Return left and right with their key columns recoded as categoricals with identical categories.
+    Only the key columns are replaced; the other columns are shared with the inputs, not copied.
     """
-    df_all = load_all_metrics(logs_root)
+    left = left.copy(deep=False)
+    right = right.copy(deep=False)
+    for key in keys:
+        cats = pd.api.types.union_categoricals(
+            [left[key].astype("category"), right[key].astype("category")]
+        ).categories
+        left[key] = pd.Categorical(left[key], categories=cats)
+        right[key] = pd.Categorical(right[key], categories=cats)
+    return left, right
 
-    for model in TARGET_MODELS:
-        df_latest = select_latest_run_for_model(df_all, model)
 
-        # Load preprocessing sizes
-        sizes_df = load_latest_preprocessing_sizes(
-            "outputs/preprocessing-techniques/sample-visualization_20260210_135855"
-        )
+# Size/ROI columns of the preprocessing sizes table that are merged into the metrics
+SIZES_EXTRA_COLUMN_PATTERN = re.compile(r"(?:roi_|image_|img_|original_|full_|processed_)")
 
-        # Align naming (your metrics uses "preprocessor")
-        sizes_df = sizes_df.rename(columns={"technique": "preprocessor"})
 
-        print("\n--- sizes_df columns ---")
-        print(sorted(list(sizes_df.columns)))
-        print("--- sample rows ---")
-        print(sizes_df.head(3).to_string(index=False))
+def plot_preprocessors_for_latest_run_per_model(logs_root: str = "logs", executor: Executor | None = None) -> None:
+    """
+    For each model in TARGET_MODELS:
+      - pick the latest experiment
+      - plot metrics grouped by preprocessor
+      - save under logs/<experiment_id>/plots_by_preprocessor/
+    """
+    df_all = load_all_metrics(logs_root, models=TARGET_MODELS)
+    latest_exp_ids = latest_experiment_per_model(df_all)
 
+    # Load preprocessing sizes once; the same table is merged into every model's run
+    sizes_df = load_latest_preprocessing_sizes(
+        "outputs/preprocessing-techniques/sample-visualization_20260210_135855"
+    )
 
-        # Merge on sample_id + preprocessor
-        df_latest["sample_id"] = df_latest["sample_id"].astype(str)
+    # Align naming (your metrics uses "preprocessor")
+    sizes_df = sizes_df.rename(columns={"technique": "preprocessor"})
 
-        # Merge preprocessing size + ROI metadata (keep bytes + any roi/image dimension columns if present)
-        keep_cols = ["sample_id", "preprocessor", "processed_binary_bytes", "data_url_bytes_utf8_total"]
+    print("\n--- sizes_df columns ---")
+    print(sorted(list(sizes_df.columns)))
+    print("--- sample rows ---")
+    print(sizes_df.head(3).to_string(index=False))
 
-        extra_prefixes = ("roi_", "image_", "img_", "original_", "full_", "processed_")
+    # Merge preprocessing size + ROI metadata (keep bytes + any roi/image dimension columns if present)
+    # dict.fromkeys keeps the column order while dropping names that are listed and also match a prefix
+    keep_cols = list(dict.fromkeys(
+        ["sample_id", "preprocessor", "processed_binary_bytes", "data_url_bytes_utf8_total"]
+        + [c for c in sizes_df.columns if SIZES_EXTRA_COLUMN_PATTERN.match(c)]
+    ))
 
-        for c in sizes_df.columns:
-            if c in keep_cols:
-                continue
-            if c.startswith(extra_prefixes):
-                keep_cols.append(c)
+    sizes_df = sizes_df[keep_cols]
+    keys = ["sample_id", "preprocessor"]
 
-        df_latest = df_latest.merge(
-            sizes_df[keep_cols],
-            on=["sample_id", "preprocessor"],
-            how="left",
-        )
+    for model in TARGET_MODELS:
+        df_latest = select_latest_run_for_model(df_all, model, latest_exp_ids)
 
+        # Join on sample_id + preprocessor
+        # Shared categorical keys let the join compare integer codes, not strings; the
+        # lookup side is indexed by the keys so only df_latest's key columns are hashed
+        sizes_keep, df_latest = _with_shared_categories(sizes_df, df_latest, keys)
+        df_latest = df_latest.join(sizes_keep.set_index(keys), on=keys, how="left")
 
         exp_id = df_latest["experiment_id"].iloc[0]
         base_dir = Path(logs_root) / exp_id
 
-        # Merge per-sample VQA accuracy from vqa_eval.json
+        # Join per-sample VQA accuracy from vqa_eval.json
         acc_df = load_vqa_eval_details_for_experiment(base_dir)
         if not acc_df.empty:
-            df_latest = df_latest.merge(
-                acc_df,
-                on=["sample_id", "preprocessor"],
-                how="left",
-            )
+            df_latest = df_latest.join(acc_df.set_index(keys), on=keys, how="left")
+
+        df_latest = df_latest.reset_index(drop=True)
 
 
         out_dir = base_dir / "plots_by_preprocessor"
@@ -553,30 +926,56 @@ def plot_preprocessors_for_latest_run_per_model(logs_root: str = "logs") -> None
             group_by="preprocessor",
             save_dir=out_dir,
             title_prefix=f"{model} | ",
+            executor=executor,
         )
 
 
-def plot_models_by_preprocessor_across_latest_runs(logs_root: str = "logs") -> None:
+def _combined_labels(left: pd.Series, right: pd.Series, sep: str) -> pd.Categorical:
+    """
+    Categorical of "<left><sep><right>" per row (same text as str concatenation).
+    The rows are keyed on the pair of category codes, so only the distinct
+    combinations are ever formatted as strings.
+    """
+    left = left.astype("category")
+    right = right.astype("category")
+    lcodes = left.cat.codes.to_numpy(dtype=np.int64)
+    rcodes = right.cat.codes.to_numpy(dtype=np.int64)
+    pair_codes, uniques = pd.factorize((lcodes + 1) * (len(right.cat.categories) + 1) + (rcodes + 1))
+
+    # Missing values print as "nan", like astype(str) does
+    lnames = np.array(["nan"] + [str(c) for c in left.cat.categories], dtype=object)
+    rnames = np.array(["nan"] + [str(c) for c in right.cat.categories], dtype=object)
+    li, ri = np.divmod(uniques, len(right.cat.categories) + 1)
+    labels = [f"{l}{sep}{r}" for l, r in zip(lnames[li], rnames[ri])]
+    return pd.Categorical.from_codes(pair_codes, categories=labels)
+
+
+def plot_models_by_preprocessor_across_latest_runs(logs_root: str = "logs", executor: Executor | None = None) -> None:
     """
     Builds a combined dataframe containing ONLY the latest run of each model,
     then produces plots where the grouping label is "preprocessor | model".
     """
-    df_all = load_all_metrics(logs_root)
+    df_all = load_all_metrics(logs_root, models=TARGET_MODELS)
+    latest_exp_ids = latest_experiment_per_model(df_all)
 
-    latest_dfs = []
+    # Collect the row positions of every model's latest run and gather them in one take,
+    # instead of copying each run out of df_all and then copying them all again in a concat
+    positions = []
     for model in TARGET_MODELS:
-        try:
-            latest_dfs.append(select_latest_run_for_model(df_all, model))
-        except RuntimeError as e:
-            print(f"Skipping {model!r}: {e}")
+        latest_exp_id = latest_exp_ids.get(model)
+        if latest_exp_id is None:
+            print(f"Skipping {model!r}: No runs found for model {model!r}")
+            continue
+        print(f"Using latest run for model {model!r}: experiment_id = {latest_exp_id}")
+        positions.append(np.flatnonzero(df_all["experiment_id"] == latest_exp_id))
 
-    if not latest_dfs:
+    if not positions:
         raise RuntimeError("No latest runs found for any target models")
 
-    df_latest_all = pd.concat(latest_dfs, ignore_index=True)
+    df_latest_all = df_all.take(np.concatenate(positions)).reset_index(drop=True)
 
-    df_latest_all["preprocessor_model"] = (
-        df_latest_all["preprocessor"].astype(str) + " | " + df_latest_all["model"].astype(str)
+    df_latest_all["preprocessor_model"] = _combined_labels(
+        df_latest_all["preprocessor"], df_latest_all["model"], sep=" | "
     )
 
     out_dir = Path(logs_root) / "_combined_latest" / "plots_by_preprocessor_and_model"
@@ -587,12 +986,16 @@ def plot_models_by_preprocessor_across_latest_runs(logs_root: str = "logs") -> N
         group_by="preprocessor_model",
         save_dir=out_dir,
         title_prefix="Combined latest runs | ",
+        executor=executor,
     )
 
 
 def main():
-    plot_preprocessors_for_latest_run_per_model("logs")
-    # plot_models_by_preprocessor_across_latest_runs("logs")
+    # One pool for every model's boxplots: the workers start (and import matplotlib)
+    # once, and each keeps reusing its figure across models
+    with ProcessPoolExecutor() as ex:
+        plot_preprocessors_for_latest_run_per_model("logs", executor=ex)
+        # plot_models_by_preprocessor_across_latest_runs("logs", executor=ex)
 
 
 if __name__ == "__main__":
@@ -1,73 +1,129 @@
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib import cbook, rcParams, style
+from matplotlib.figure import Figure, SubplotParams
+from matplotlib.lines import Line2D
 from pathlib import Path
 
-OUT_DIR = Path("outputs/preprocessing-techniques")
+# Shared best-effort pickle caches. The scripts are run directly from different folders,
+# so each loads Experiments/pickle_cache.py by file path rather than through sys.path.
+_spec = importlib.util.spec_from_file_location("pickle_cache", Path(__file__).resolve().parent.parent / "pickle_cache.py")
+pickle_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pickle_cache)
 
-# -----------------------------
-# Helpers: overlap computations
-# -----------------------------
+OUT_DIR = Path("outputs/preprocessing-techniques")
 
-def _safe_div(a: float, b: float) -> float:
-    if b == 0:
-        return 0.0
-    return a / b
+# PNG encoder settings for every saved plot: light zlib compression, which is much
+# faster to write and only makes the files somewhat larger
+PNG_SAVE_OPTIONS = {"compress_level": 1}
 
-def rect_iou(ax, ay, aw, ah, bx, by, bw, bh) -> float:
-    """IoU of two axis-aligned rectangles."""
-    if any(v is None for v in [ax, ay, aw, ah, bx, by, bw, bh]):
-        return float("nan")
+# The time/size overviews keep 200 dpi; the secondary plots (std/cv bars, ROI
+# overlap and ROI counts) do not need print quality
+SECONDARY_DPI = 150
 
-    ax2, ay2 = ax + aw, ay + ah
-    bx2, by2 = bx + bw, by + bh
+# -----------------------------
+# Helpers: cached CSV loading
+# -----------------------------
 
-    ix1 = max(ax, bx)
-    iy1 = max(ay, by)
-    ix2 = min(ax2, bx2)
-    iy2 = min(ay2, by2)
+def load_csv_cached(path: Path, columns: list[str] | None = None, dtype: dict | None = None) -> pd.DataFrame:
+    """
+    pd.read_csv(path) restricted to the given columns (those the file has) and
+    dtypes, reusing a parsed copy pickled next to the CSV (<name>.cache.pkl)
+    until the CSV's mtime or the requested columns/dtypes change.
+    """
+    stamp = (path.stat().st_mtime_ns, columns, dtype)
+    cache_path = path.with_name(path.stem + ".cache.pkl")
+
+    cached = pickle_cache.read_cache(cache_path)
+    if cached is None or cached.get("stamp") != stamp:
+        # A callable usecols skips absent columns instead of failing, so the
+        # callers can still report missing columns with their own message
+        usecols = (lambda c: c in columns) if columns is not None else None
+        cached = {"stamp": stamp, "df": pd.read_csv(path, usecols=usecols, dtype=dtype)}
+        pickle_cache.write_cache(cache_path, cached)
+    return cached["df"]
+
+# Columns the plots below read from each CSV. technique only takes a handful of
+# values, so it is parsed as a categorical: filters and groupbys then work on codes.
+# Timings, byte counts and ROI boxes all fit 32-bit types, which halves their size;
+# the byte counts are nullable Int32 so a blank cell reads as <NA> instead of failing.
+TIMES_COLS = ["technique", "time_ms"]
+TIMES_DTYPES = {"technique": "category", "time_ms": "float32"}
+SIZES_COLS = ["technique", "original_binary_bytes", "processed_binary_bytes", "compression_ratio"]
+SIZES_DTYPES = {
+    "technique": "category",
+    "original_binary_bytes": "Int32",
+    "processed_binary_bytes": "Int32",
+    "compression_ratio": "float32",
+}
+ROI_COLS = [
+    "technique", "image_id",
+    "roi_x", "roi_y", "roi_box_w", "roi_box_h", "roi_pixels_w", "roi_pixels_h",
+]
+ROI_DTYPES = {"technique": "category", **{c: "float32" for c in ROI_COLS[2:]}}
 
-    iw = max(0.0, ix2 - ix1)
-    ih = max(0.0, iy2 - iy1)
-    inter = iw * ih
+# -----------------------------
+# Helpers: overlap computations
+# -----------------------------
 
-    a_area = max(0.0, aw) * max(0.0, ah)
-    b_area = max(0.0, bw) * max(0.0, bh)
+def _intersection_area(ax, ay, aw, ah, bx, by, bw, bh) -> np.ndarray:
+    """Intersection area of axis-aligned rectangles, elementwise over arrays."""
+    iw = np.clip(np.minimum(ax + aw, bx + bw) - np.maximum(ax, bx), 0.0, None)
+    ih = np.clip(np.minimum(ay + ah, by + bh) - np.maximum(ay, by), 0.0, None)
+    return iw * ih
+
+def rect_iou(ax, ay, aw, ah, bx, by, bw, bh) -> np.ndarray:
+    """IoU of axis-aligned rectangles, elementwise over arrays (NaN inputs give NaN)."""
+    inter = _intersection_area(ax, ay, aw, ah, bx, by, bw, bh)
+    a_area = np.clip(aw, 0.0, None) * np.clip(ah, 0.0, None)
+    b_area = np.clip(bw, 0.0, None) * np.clip(bh, 0.0, None)
     union = a_area + b_area - inter
-    return _safe_div(inter, union)
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union != 0)
 
-def rect_overlap_fraction_of_a(ax, ay, aw, ah, bx, by, bw, bh) -> float:
-    """Intersection area divided by area(A). Asymmetric overlap."""
-    if any(v is None for v in [ax, ay, aw, ah, bx, by, bw, bh]):
-        return float("nan")
+def rect_overlap_fraction_of_a(ax, ay, aw, ah, bx, by, bw, bh) -> np.ndarray:
+    """Intersection area divided by area(A), elementwise over arrays. Asymmetric overlap."""
+    inter = _intersection_area(ax, ay, aw, ah, bx, by, bw, bh)
+    a_area = np.clip(aw, 0.0, None) * np.clip(ah, 0.0, None)
+    return np.divide(inter, a_area, out=np.zeros_like(inter), where=a_area != 0)
 
-    ax2, ay2 = ax + aw, ay + ah
-    bx2, by2 = bx + bw, by + bh
-
-    ix1 = max(ax, bx)
-    iy1 = max(ay, by)
-    ix2 = min(ax2, bx2)
-    iy2 = min(ay2, by2)
-
-    iw = max(0.0, ix2 - ix1)
-    ih = max(0.0, iy2 - iy1)
-    inter = iw * ih
-
-    a_area = max(0.0, aw) * max(0.0, ah)
-    return _safe_div(inter, a_area)
-
-def pick_single_roi(df_tech: pd.DataFrame) -> pd.DataFrame:
+def pick_single_roi(df_tech: pd.DataFrame, keys: list[str] | None = None) -> pd.DataFrame:
     """
     If a technique produces multiple ROIs for the same image,
     select the largest ROI (by roi_box_w * roi_box_h) per image_id.
+    Pass keys=["technique", "image_id"] to do this for several techniques in one pass.
     """
+    keys = keys or ["image_id"]
     df = df_tech.copy()
     # If box dims missing, fallback to roi_pixels_w/h (still useful for size)
-    df["box_w_eff"] = df["roi_box_w"].where(df["roi_box_w"].notna(), df["roi_pixels_w"])
-    df["box_h_eff"] = df["roi_box_h"].where(df["roi_box_h"].notna(), df["roi_pixels_h"])
+    df["box_w_eff"] = df["roi_box_w"].fillna(df["roi_pixels_w"])
+    df["box_h_eff"] = df["roi_box_h"].fillna(df["roi_pixels_h"])
     df["area_eff"] = df["box_w_eff"].fillna(0) * df["box_h_eff"].fillna(0)
 
-    df = df.sort_values(["image_id", "area_eff"], ascending=[True, False])
-    return df.groupby("image_id", as_index=False).head(1)
+    # One hash-grouped reduction instead of sorting the whole frame for a top-1 per group
+    return df.loc[df.groupby(keys, observed=True)["area_eff"].idxmax()]
+
+def group_mean_std(keys: pd.Series, values: pd.Series) -> pd.DataFrame:
+    """
+    Per-group mean and sample std (NaN skipped) of values, as
+    values.groupby(keys, observed=True, sort=False).agg(["mean", "std"]) gives,
+    but computed with np.bincount over the factorized keys.
+    """
+    codes, uniques = pd.factorize(keys)
+    x = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    ok = (codes >= 0) & ~np.isnan(x)
+    codes, x = codes[ok], x[ok]
+
+    n = len(uniques)
+    count = np.bincount(codes, minlength=n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.bincount(codes, weights=x, minlength=n) / count
+        dev = x - mean[codes]
+        std = np.sqrt(np.bincount(codes, weights=dev * dev, minlength=n) / (count - 1))
+    return pd.DataFrame({"mean": mean, "std": std}, index=pd.Index(uniques, name=keys.name))
 
 def require_bbox_cols(df: pd.DataFrame, label: str) -> None:
     need = ["roi_x", "roi_y", "roi_box_w", "roi_box_h"]
@@ -80,330 +136,365 @@ def require_bbox_cols(df: pd.DataFrame, label: str) -> None:
         )
 
 # -----------------------------
-# Timing plots (existing)
+# Plot renderers
 # -----------------------------
+# Each plot is rendered from plain arrays/lists (boxplots from precomputed
+# cbook.boxplot_stats) so it can be shipped to a worker process cheaply;
+# every renderer writes one PNG and returns its path.
 
-PATTERN = "PreprocessingTimes_*.csv"
-csv_files = sorted(OUT_DIR.glob(PATTERN), key=lambda p: p.stat().st_mtime)
-
-if not csv_files:
-    raise FileNotFoundError(f"No files matching {PATTERN} in {OUT_DIR}")
-
-CSV_PATH = csv_files[-1]
-print(f"Using latest file: {CSV_PATH}")
-
-df = pd.read_csv(CSV_PATH)
-
-# Box-and-whisker: execution time per image (excluding YOLOv12)
-BOXPLOT_EXCLUDE = "YoloV12SalientRoi+GlobalThumb"
-df_box = df[df["technique"] != BOXPLOT_EXCLUDE]
-
-techniques = sorted(df_box["technique"].unique().tolist())
-data = [df_box[df_box["technique"] == t]["time_ms"].values for t in techniques]
-
-plt.figure()
-plt.boxplot(data, labels=techniques, showfliers=True)
-plt.xlabel("Preprocessing technique")
-plt.ylabel("Time in ms")
-plt.xticks(rotation=30, ha="right")
-plt.tight_layout()
+# Each worker process draws all of its plots on one figure, cleared in between
+_FIGURE: Figure | None = None
 
-out1 = Path(CSV_PATH).with_name("boxplot_execution_time.png")
-plt.savefig(out1, dpi=200)
-plt.close()
 
-# Bar chart: average time per technique
-avg = df.groupby("technique")["time_ms"].mean().sort_values()
-plt.figure()
-plt.bar(avg.index.tolist(), avg.values)
-plt.xlabel("Preprocessing technique")
-plt.ylabel("Average time in ms")
-plt.xticks(rotation=30, ha="right")
-plt.tight_layout()
-out2 = Path(CSV_PATH).with_name("barchart_avg_time.png")
-plt.savefig(out2, dpi=200)
-plt.close()
-
-print("Wrote:", out1)
-print("Wrote:", out2)
+def _figure() -> Figure:
+    global _FIGURE
+    if _FIGURE is None:
+        _FIGURE = Figure()
+    else:
+        # clear() keeps the margins the previous tight_layout() settled on
+        _FIGURE.clear()
+        _FIGURE.subplotpars = SubplotParams()
+    return _FIGURE
+
+def _rotate_xticks(ax, rotation: int) -> None:
+    for label in ax.get_xticklabels():
+        label.set(rotation=rotation, ha="right")
+
+def plot_bar(labels: np.ndarray, values: np.ndarray, ylabel: str, out_path: Path, dpi: int = 200) -> Path:
+    fig = _figure()
+    ax = fig.subplots()
+    ax.bar(labels, values)
+    ax.set_xlabel("Preprocessing technique")
+    ax.set_ylabel(ylabel)
+    _rotate_xticks(ax, 30)
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=dpi, pil_kwargs=PNG_SAVE_OPTIONS)
+    return out_path
+
+def plot_boxplot(
+    stats: list[dict],
+    ylabel: str,
+    out_path: Path,
+    xlabel: str | None = None,
+    rotation: int = 0,
+    dpi: int = 200,
+) -> Path:
+    fig = _figure()
+    ax = fig.subplots()
+    ax.bxp(stats, showfliers=True)
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    if rotation:
+        _rotate_xticks(ax, rotation)
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=dpi, pil_kwargs=PNG_SAVE_OPTIONS)
+    return out_path
+
+def plot_size_ratio_scatter(
+    x: np.ndarray, y: np.ndarray, codes: np.ndarray, techs: list[str], out_path: Path
+) -> Path:
+    # All points go into one scatter collection, coloured per technique from the
+    # default colour cycle (sorted by name); the legend gets one proxy marker each
+    palette = rcParams["axes.prop_cycle"].by_key()["color"]
+    colors = [palette[i % len(palette)] for i in range(len(techs))]
+
+    # Stable sort by technique so later techniques are still drawn on top, as with one call per technique
+    order = np.argsort(codes, kind="stable")
+
+    fig = _figure()
+    ax = fig.subplots()
+    ax.scatter(x[order], y[order], c=np.take(colors, codes[order]), s=10)
+    ax.set_xlabel("Original size (bytes)")
+    ax.set_ylabel("Compression factor (processed/original)")
+    ax.legend(handles=[
+        Line2D([], [], linestyle="", marker="o", markersize=np.sqrt(10), color=color, label=tech)
+        for color, tech in zip(colors, techs)
+    ])
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
+    return out_path
+
+def plot_overlap_scatter(gaze_in_sal: np.ndarray, sal_in_gaze: np.ndarray, out_path: Path) -> Path:
+    fig = _figure()
+    ax = fig.subplots()
+    ax.scatter(gaze_in_sal, sal_in_gaze, s=12)
+    ax.set_xlabel("Overlap fraction: (Gaze ROI ∩ Saliency ROI) / Gaze ROI")
+    ax.set_ylabel("Overlap fraction: (Gaze ROI ∩ Saliency ROI) / Saliency ROI")
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=SECONDARY_DPI, pil_kwargs=PNG_SAVE_OPTIONS)
+    return out_path
+
+def plot_corr_heatmap(mat: np.ndarray, labels: list[str], out_path: Path) -> Path:
+    # Correlation heatmap (no seaborn)
+    fig = _figure()
+    ax = fig.subplots()
+    ax.imshow(mat, aspect="auto")
+    ax.set_xticks(range(len(labels)), labels, rotation=20, ha="right")
+    ax.set_yticks(range(len(labels)), labels)
+
+    # annotate cells
+    for (i, j), value in np.ndenumerate(mat):
+        ax.text(j, i, f"{value:.2f}", ha="center", va="center")
+
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=SECONDARY_DPI, pil_kwargs=PNG_SAVE_OPTIONS)
+    return out_path
+
+def _run(task: tuple) -> Path:
+    fn, args = task
+    # Batch rendering: simplify paths aggressively and draw them in chunks. Applied
+    # per task in the worker, so importing this module leaves rcParams untouched.
+    with style.context("fast"):
+        return fn(*args)
 
 # -----------------------------
-# Size plots (existing)
+# Main
 # -----------------------------
 
-sizes_csv = sorted(OUT_DIR.glob("PreprocessingSizes_*.csv"), key=lambda p: p.stat().st_mtime)
-if not sizes_csv:
-    print("No PreprocessingSizes_*.csv found. Skipping size plots.")
-else:
-    SIZES_PATH = sizes_csv[-1]
-    print(f"Using latest size file: {SIZES_PATH}")
-    ds = pd.read_csv(SIZES_PATH)
-
-    ds["technique_lower"] = ds["technique"].astype(str).str.lower()
-
-    # 1) Scatter: compression ratio vs original bytes, excluding BMP
-    ds_scatter = ds[~ds["technique_lower"].str.contains("bmp", na=False)].copy()
-
-    plt.figure()
-    for tech in sorted(ds_scatter["technique"].unique()):
-        sub = ds_scatter[ds_scatter["technique"] == tech]
-        plt.scatter(sub["original_binary_bytes"], sub["compression_ratio"], label=tech, s=10)
-
-    plt.xlabel("Original size (bytes)")
-    plt.ylabel("Compression factor (processed/original)")
-    plt.legend()
-    plt.tight_layout()
-
-    out3 = Path(SIZES_PATH).with_name("scatter_size_ratio.png")
-    plt.savefig(out3, dpi=200)
-    plt.close()
-    print("Wrote:", out3)
-
-    # 2) Bar chart: average processed bytes per technique (exclude BMP)
-    ds_bar = ds[~ds["technique_lower"].str.contains("bmp", na=False)]
-    avg_processed = ds_bar.groupby("technique")["processed_binary_bytes"].mean().sort_values()
-
-    plt.figure()
-    plt.bar(avg_processed.index.tolist(), avg_processed.values)
-    plt.xlabel("Preprocessing technique")
-    plt.ylabel("Average processed bytes")
-    plt.xticks(rotation=30, ha="right")
-    plt.tight_layout()
-
-    out4 = Path(SIZES_PATH).with_name("barchart_avg_processed_bytes.png")
-    plt.savefig(out4, dpi=200)
-    plt.close()
-    print("Wrote:", out4)
+def main() -> None:
+    # The plots below are only collected as (renderer, args) tasks here and
+    # rendered in parallel at the end, one worker process per PNG.
+    tasks = []
 
-        # Bar chart: coefficient of variation for processed size (std / mean) per technique
-    size_stats = (
-        ds_bar.groupby("technique")["processed_binary_bytes"]
-        .agg(["mean", "std"])
-    )
-
-    # Avoid division by zero
-    size_stats["cv"] = size_stats["std"] / size_stats["mean"].replace(0, pd.NA)
-    size_stats = size_stats.dropna(subset=["cv"]).sort_values("cv")
-
-    plt.figure()
-    plt.bar(size_stats.index.tolist(), size_stats["cv"].values)
-    plt.xlabel("Preprocessing technique")
-    plt.ylabel("Processed size Coefficient of variation (std / mean)")
-    plt.xticks(rotation=30, ha="right")
-    plt.tight_layout()
-
-    out_cv_size = Path(SIZES_PATH).with_name("barchart_cv_processed_bytes.png")
-    plt.savefig(out_cv_size, dpi=200)
-    plt.close()
-    print("Wrote:", out_cv_size)
-
-
-    # Bar chart: standard deviation of time per technique
-    std = df.groupby("technique")["time_ms"].std().sort_values()
-
-    plt.figure()
-    plt.bar(std.index.tolist(), std.values)
-    plt.xlabel("Preprocessing technique")
-    plt.ylabel("Standard deviation of time in ms")
-    plt.xticks(rotation=30, ha="right")
-    plt.tight_layout()
-
-    out_std = Path(CSV_PATH).with_name("barchart_std_time.png")
-    plt.savefig(out_std, dpi=200)
-    plt.close()
-    print("Wrote:", out_std)
-
-    # Bar chart: coefficient of variation (std / mean) per technique
-    stats = df.groupby("technique")["time_ms"].agg(["mean", "std"])
-    stats["cv"] = stats["std"] / stats["mean"]
-    stats = stats.sort_values("cv")
-
-    plt.figure()
-    plt.bar(stats.index.tolist(), stats["cv"].values)
-    plt.xlabel("Preprocessing technique")
-    plt.ylabel("Coefficient of variation for time (std / mean)")
-    plt.xticks(rotation=30, ha="right")
-    plt.tight_layout()
-
-    out_cv = Path(CSV_PATH).with_name("barchart_cv_time.png")
-    plt.savefig(out_cv, dpi=200)
-    plt.close()
-    print("Wrote:", out_cv)
+    # -----------------------------
+    # Timing plots (existing)
+    # -----------------------------
 
-# -----------------------------
-# NEW: ROI overlap analysis
-# -----------------------------
+    PATTERN = "PreprocessingTimes_*.csv"
+    csv_files = sorted(OUT_DIR.glob(PATTERN), key=lambda p: p.stat().st_mtime)
 
-roi_csv = sorted(OUT_DIR.glob("PreprocessingRois_*.csv"), key=lambda p: p.stat().st_mtime)
-if not roi_csv:
-    print("No PreprocessingRois_*.csv found. Skipping ROI overlap plots.")
-else:
-    ROI_PATH = roi_csv[-1]
-    print(f"Using latest ROI file: {ROI_PATH}")
-    dr = pd.read_csv(ROI_PATH)
+    if not csv_files:
+        raise FileNotFoundError(f"No files matching {PATTERN} in {OUT_DIR}")
 
-    # Techniques to compare
-    GAZE_TECH = "GazeRoi+GlobalThumb"
-    SAL_TECH = "SalientRoi+GlobalThumb"
+    CSV_PATH = csv_files[-1]
+    print(f"Using latest file: {CSV_PATH}")
 
-    gaze = dr[dr["technique"] == GAZE_TECH].copy()
-    sal = dr[dr["technique"] == SAL_TECH].copy()
+    df = load_csv_cached(CSV_PATH, TIMES_COLS, TIMES_DTYPES)
 
-    if gaze.empty or sal.empty:
-        print(f"Missing ROI rows for gaze or saliency. gaze={len(gaze)} sal={len(sal)}. Skipping overlap plots.")
-    else:
-        # Need bbox to compute overlap meaningfully
-        require_bbox_cols(gaze, "Gaze")
-        require_bbox_cols(sal, "Saliency")
-
-        # Ensure numeric
-        for col in ["roi_x", "roi_y", "roi_box_w", "roi_box_h"]:
-            gaze[col] = pd.to_numeric(gaze[col], errors="coerce")
-            sal[col] = pd.to_numeric(sal[col], errors="coerce")
-
-        # If multiple ROIs per image: pick a single ROI (largest) for each technique
-        gaze1 = pick_single_roi(gaze)
-        sal1 = pick_single_roi(sal)
-
-        # Inner join by image_id
-        m = gaze1.merge(
-            sal1,
-            on="image_id",
-            suffixes=("_gaze", "_sal"),
-            how="inner"
-        )
+    # Mean, std and cv of the time per technique, from one groupby shared by the bar charts below.
+    # Sorted once by mean time: all time bar charts use this technique order.
+    time_stats = group_mean_std(df["technique"], df["time_ms"])
+    time_stats["cv"] = time_stats["std"] / time_stats["mean"]
+    time_stats = time_stats.sort_values("mean")
+    time_labels = time_stats.index.to_numpy(dtype=str)
 
-        if m.empty:
-            print("No overlapping image_id rows between gaze and saliency. Skipping overlap plots.")
-        else:
-            # Compute:
-            # - IoU (symmetric)
-            # - overlap fraction gaze->sal (intersection / gaze area)
-            # - overlap fraction sal->gaze (intersection / sal area)
-            m["iou"] = m.apply(
-                lambda r: rect_iou(
-                    r["roi_x_gaze"], r["roi_y_gaze"], r["roi_box_w_gaze"], r["roi_box_h_gaze"],
-                    r["roi_x_sal"],  r["roi_y_sal"],  r["roi_box_w_sal"],  r["roi_box_h_sal"]
-                ),
-                axis=1
-            )
+    # Box-and-whisker: execution time per image (excluding YOLOv12)
+    BOXPLOT_EXCLUDE = "YoloV12SalientRoi+GlobalThumb"
+    df_box = df[df["technique"] != BOXPLOT_EXCLUDE]
 
-            m["gaze_in_sal"] = m.apply(
-                lambda r: rect_overlap_fraction_of_a(
-                    r["roi_x_gaze"], r["roi_y_gaze"], r["roi_box_w_gaze"], r["roi_box_h_gaze"],
-                    r["roi_x_sal"],  r["roi_y_sal"],  r["roi_box_w_sal"],  r["roi_box_h_sal"]
-                ),
-                axis=1
-            )
+    # One pass over the frame splits the times per technique (sorted by name)
+    groups = {t: g["time_ms"].to_numpy(copy=False) for t, g in df_box.groupby("technique", observed=True, sort=True)}
+    tasks.append((plot_boxplot, (
+        cbook.boxplot_stats(list(groups.values()), labels=list(groups)), "Time in ms",
+        Path(CSV_PATH).with_name("boxplot_execution_time.png"), "Preprocessing technique", 30,
+    )))
 
-            m["sal_in_gaze"] = m.apply(
-                lambda r: rect_overlap_fraction_of_a(
-                    r["roi_x_sal"],  r["roi_y_sal"],  r["roi_box_w_sal"],  r["roi_box_h_sal"],
-                    r["roi_x_gaze"], r["roi_y_gaze"], r["roi_box_w_gaze"], r["roi_box_h_gaze"]
-                ),
-                axis=1
-            )
+    # Bar chart: average time per technique
+    tasks.append((plot_bar, (
+        time_labels, time_stats["mean"].to_numpy(copy=False), "Average time in ms", Path(CSV_PATH).with_name("barchart_avg_time.png"),
+    )))
 
-            # Clean invalid
-            m = m.dropna(subset=["iou", "gaze_in_sal", "sal_in_gaze"]).copy()
-
-            # Correlations (Pearson) between the two asymmetric overlaps
-            corr = m[["gaze_in_sal", "sal_in_gaze", "iou"]].corr(method="pearson")
-
-            # 1) Scatter plot: gaze_in_sal vs sal_in_gaze
-            plt.figure()
-            plt.scatter(m["gaze_in_sal"], m["sal_in_gaze"], s=12)
-            plt.xlabel("Overlap fraction: (Gaze ROI ∩ Saliency ROI) / Gaze ROI")
-            plt.ylabel("Overlap fraction: (Gaze ROI ∩ Saliency ROI) / Saliency ROI")
-            plt.tight_layout()
-
-            out_overlap_scatter = Path(ROI_PATH).with_name("overlap_scatter_gaze_vs_saliency.png")
-            plt.savefig(out_overlap_scatter, dpi=250)
-            plt.close()
-            print("Wrote:", out_overlap_scatter)
-
-            # 2) Boxplot: distributions of overlaps + IoU
-            plt.figure()
-            plt.boxplot(
-                [m["gaze_in_sal"].values, m["sal_in_gaze"].values, m["iou"].values],
-                labels=["Gaze ROI in Saliency ROI", "Saliency ROI in Gaze ROI", "Intersection over Union"],
-                showfliers=True
-            )
-            plt.ylabel("Overlap (0..1)")
-            plt.xticks(rotation=15, ha="right")
-            plt.tight_layout()
-
-            out_overlap_box = Path(ROI_PATH).with_name("overlap_boxplot_gaze_saliency.png")
-            plt.savefig(out_overlap_box, dpi=250)
-            plt.close()
-            print("Wrote:", out_overlap_box)
-
-            # 3) Correlation heatmap (no seaborn)
-            plt.figure()
-            mat = corr.values
-            plt.imshow(mat, aspect="auto")
-            plt.xticks(range(len(corr.columns)), corr.columns, rotation=20, ha="right")
-            plt.yticks(range(len(corr.index)), corr.index)
-
-            # annotate cells
-            for i in range(mat.shape[0]):
-                for j in range(mat.shape[1]):
-                    plt.text(j, i, f"{mat[i, j]:.2f}", ha="center", va="center")
-
-            plt.tight_layout()
-            out_corr = Path(ROI_PATH).with_name("overlap_corr_heatmap_gaze_saliency.png")
-            plt.savefig(out_corr, dpi=250)
-            plt.close()
-            print("Wrote:", out_corr)
-
-            # Optional: print quick stats for your log
-            print()
-            print(f"Overlap stats (n={len(m)} matched images):")
-            print(f"- mean Intersection over Union:     {m['iou'].mean():.3f}")
-            print(f"- mean gaze_in_sal:                 {m['gaze_in_sal'].mean():.3f}")
-            print(f"- mean sal_in_gaze:                 {m['sal_in_gaze'].mean():.3f}")
-            print("Pearson correlation matrix:")
-            print(corr.round(3))
+    # -----------------------------
+    # Size plots (existing)
+    # -----------------------------
 
+    sizes_csv = sorted(OUT_DIR.glob("PreprocessingSizes_*.csv"), key=lambda p: p.stat().st_mtime)
+    if not sizes_csv:
+        print("No PreprocessingSizes_*.csv found. Skipping size plots.")
+    else:
+        SIZES_PATH = sizes_csv[-1]
+        print(f"Using latest size file: {SIZES_PATH}")
+        ds = load_csv_cached(SIZES_PATH, SIZES_COLS, SIZES_DTYPES)
+
+        # BMP techniques are left out of all size plots; the check only runs over the categories
+        bmp_cats = [c for c in ds["technique"].cat.categories if "bmp" in str(c).lower()]
+        ds_non_bmp = ds[~ds["technique"].isin(bmp_cats)]
+
+        # 1) Scatter: compression ratio vs original bytes, excluding BMP
+        ds_scatter = ds_non_bmp
+        codes, techs = pd.factorize(ds_scatter["technique"], sort=True)
+        tasks.append((plot_size_ratio_scatter, (
+            ds_scatter["original_binary_bytes"].to_numpy(dtype=np.float64, na_value=np.nan),
+            ds_scatter["compression_ratio"].to_numpy(),
+            codes, [str(t) for t in techs], Path(SIZES_PATH).with_name("scatter_size_ratio.png"),
+        )))
+
+        # 2) Bar chart: average processed bytes per technique (exclude BMP)
+        ds_bar = ds_non_bmp
+
+        # Mean, std and cv (avoiding division by zero) of the processed size per technique,
+        # from one groupby for both bar charts, which share its order by mean size
+        size_stats = group_mean_std(ds_bar["technique"], ds_bar["processed_binary_bytes"])
+        size_stats["cv"] = size_stats["std"] / size_stats["mean"].replace(0, np.nan)
+        size_stats = size_stats.sort_values("mean")
+
+        tasks.append((plot_bar, (
+            size_stats.index.to_numpy(dtype=str), size_stats["mean"].to_numpy(copy=False), "Average processed bytes",
+            Path(SIZES_PATH).with_name("barchart_avg_processed_bytes.png"),
+        )))
 
-# -----------------------------
-# NEW: YOLOv12 ROI count plot
-# -----------------------------
+        # Bar chart: coefficient of variation for processed size (std / mean) per technique
+        cv_processed = size_stats["cv"].dropna()
+        tasks.append((plot_bar, (
+            cv_processed.index.to_numpy(dtype=str), cv_processed.to_numpy(copy=False), "Processed size Coefficient of variation (std / mean)",
+            Path(SIZES_PATH).with_name("barchart_cv_processed_bytes.png"), SECONDARY_DPI,
+        )))
+
+        # Bar chart: standard deviation of time per technique
+        tasks.append((plot_bar, (
+            time_labels, time_stats["std"].to_numpy(copy=False), "Standard deviation of time in ms",
+            Path(CSV_PATH).with_name("barchart_std_time.png"), SECONDARY_DPI,
+        )))
+
+        # Bar chart: coefficient of variation (std / mean) per technique
+        tasks.append((plot_bar, (
+            time_labels, time_stats["cv"].to_numpy(copy=False), "Coefficient of variation for time (std / mean)",
+            Path(CSV_PATH).with_name("barchart_cv_time.png"), SECONDARY_DPI,
+        )))
+
+    # -----------------------------
+    # ROI file (shared by the two ROI sections below)
+    # -----------------------------
+
+    roi_csv = sorted(OUT_DIR.glob("PreprocessingRois_*.csv"), key=lambda p: p.stat().st_mtime)
+    dr = None
+    if roi_csv:
+        ROI_PATH = roi_csv[-1]
+        print(f"Using latest ROI file: {ROI_PATH}")
+        dr = load_csv_cached(ROI_PATH, ROI_COLS, ROI_DTYPES)
+
+    # -----------------------------
+    # NEW: ROI overlap analysis
+    # -----------------------------
+
+    overlap_report = None
+    if dr is None:
+        print("No PreprocessingRois_*.csv found. Skipping ROI overlap plots.")
+    else:
+        # Techniques to compare
+        GAZE_TECH = "GazeRoi+GlobalThumb"
+        SAL_TECH = "SalientRoi+GlobalThumb"
 
-roi_csv = sorted(OUT_DIR.glob("PreprocessingRois_*.csv"), key=lambda p: p.stat().st_mtime)
-if not roi_csv:
-    print("No PreprocessingRois_*.csv found. Skipping YOLO ROI count plot.")
-else:
-    ROI_PATH = roi_csv[-1]
-    dr = pd.read_csv(ROI_PATH)
+        gaze = dr[dr["technique"] == GAZE_TECH]
+        sal = dr[dr["technique"] == SAL_TECH]
 
-    YOLO_TECH = "YoloV12SalientRoi+GlobalThumb"
-    yolo = dr[dr["technique"] == YOLO_TECH].copy()
+        if gaze.empty or sal.empty:
+            print(f"Missing ROI rows for gaze or saliency. gaze={len(gaze)} sal={len(sal)}. Skipping overlap plots.")
+        else:
+            # Need bbox to compute overlap meaningfully
+            require_bbox_cols(gaze, "Gaze")
+            require_bbox_cols(sal, "Saliency")
+
+            # If multiple ROIs per image: pick a single ROI (largest) for each technique,
+            # selecting for both techniques in one groupby pass
+            best = pick_single_roi(dr[dr["technique"].isin([GAZE_TECH, SAL_TECH])], keys=["technique", "image_id"])
+            # Join on integer codes of image_id instead of hashing the file-name strings
+            best["image_code"] = pd.factorize(best["image_id"])[0]
+            gaze1 = best[best["technique"] == GAZE_TECH]
+            sal1 = best[best["technique"] == SAL_TECH].drop(columns="image_id")
+
+            # Inner join by image_id
+            m = gaze1.merge(
+                sal1,
+                on="image_code",
+                suffixes=("_gaze", "_sal"),
+                how="inner"
+            )
 
-    if yolo.empty:
-        print("No YOLOv12 ROI rows found. Skipping YOLO ROI count plot.")
+            if m.empty:
+                print("No overlapping image_id rows between gaze and saliency. Skipping overlap plots.")
+            else:
+                # Compute:
+                # - IoU (symmetric)
+                # - overlap fraction gaze->sal (intersection / gaze area)
+                # - overlap fraction sal->gaze (intersection / sal area)
+                g = [m[f"{c}_gaze"].to_numpy(dtype=np.float32, copy=False) for c in ("roi_x", "roi_y", "roi_box_w", "roi_box_h")]
+                sl = [m[f"{c}_sal"].to_numpy(dtype=np.float32, copy=False) for c in ("roi_x", "roi_y", "roi_box_w", "roi_box_h")]
+                m["iou"] = rect_iou(*g, *sl)
+                m["gaze_in_sal"] = rect_overlap_fraction_of_a(*g, *sl)
+                m["sal_in_gaze"] = rect_overlap_fraction_of_a(*sl, *g)
+
+                # Clean invalid
+                m = m.dropna(subset=["iou", "gaze_in_sal", "sal_in_gaze"]).copy()
+
+                # Correlations (Pearson) between the two asymmetric overlaps
+                corr = m[["gaze_in_sal", "sal_in_gaze", "iou"]].corr(method="pearson")
+
+                # 1) Scatter plot: gaze_in_sal vs sal_in_gaze
+                tasks.append((plot_overlap_scatter, (
+                    m["gaze_in_sal"].to_numpy(copy=False), m["sal_in_gaze"].to_numpy(copy=False),
+                    Path(ROI_PATH).with_name("overlap_scatter_gaze_vs_saliency.png"),
+                )))
+
+                # 2) Boxplot: distributions of overlaps + IoU
+                tasks.append((plot_boxplot, (
+                    cbook.boxplot_stats(
+                        [m["gaze_in_sal"].to_numpy(copy=False), m["sal_in_gaze"].to_numpy(copy=False), m["iou"].to_numpy(copy=False)],
+                        labels=["Gaze ROI in Saliency ROI", "Saliency ROI in Gaze ROI", "Intersection over Union"],
+                    ),
+                    "Overlap (0..1)", Path(ROI_PATH).with_name("overlap_boxplot_gaze_saliency.png"), None, 15, SECONDARY_DPI,
+                )))
+
+                # 3) Correlation heatmap
+                tasks.append((plot_corr_heatmap, (
+                    corr.to_numpy(), corr.columns.tolist(),
+                    Path(ROI_PATH).with_name("overlap_corr_heatmap_gaze_saliency.png"),
+                )))
+
+                overlap_report = (m, corr)
+
+    # -----------------------------
+    # NEW: YOLOv12 ROI count plot
+    # -----------------------------
+
+    roi_counts = None
+    if dr is None:
+        print("No PreprocessingRois_*.csv found. Skipping YOLO ROI count plot.")
     else:
-        # Count ROIs per image
-        roi_counts = (
-            yolo.groupby("image_id")
-            .size()
-            .values
-        )
-
-        plt.figure()
-        plt.boxplot(roi_counts, showfliers=True)
-        plt.ylabel("Number of ROIs per image")
-        plt.xticks([1], ["YOLOv12"])
-        plt.tight_layout()
-
-        out_yolo = Path(ROI_PATH).with_name("boxplot_yolov12_roi_count.png")
-        plt.savefig(out_yolo, dpi=250)
-        plt.close()
+        YOLO_TECH = "YoloV12SalientRoi+GlobalThumb"
+        yolo = dr[dr["technique"] == YOLO_TECH]
 
-        print("Wrote:", out_yolo)
+        if yolo.empty:
+            print("No YOLOv12 ROI rows found. Skipping YOLO ROI count plot.")
+        else:
+            # Count ROIs per image
+            roi_counts = (
+                yolo.groupby("image_id")
+                .size()
+                .to_numpy()
+            )
+            tasks.append((plot_boxplot, (
+                cbook.boxplot_stats([roi_counts], labels=["YOLOv12"]), "Number of ROIs per image",
+                Path(ROI_PATH).with_name("boxplot_yolov12_roi_count.png"), None, 0, SECONDARY_DPI,
+            )))
+
+    # -----------------------------
+    # Render
+    # -----------------------------
+
+    with ProcessPoolExecutor(max_workers=max(1, min(len(tasks), os.cpu_count() or 1))) as ex:
+        for out_path in ex.map(_run, tasks):
+            print("Wrote:", out_path)
+
+    if overlap_report is not None:
+        m, corr = overlap_report
+        # Optional: print quick stats for your log
+        print()
+        print(f"Overlap stats (n={len(m)} matched images):")
+        print(f"- mean Intersection over Union:     {m['iou'].mean():.3f}")
+        print(f"- mean gaze_in_sal:                 {m['gaze_in_sal'].mean():.3f}")
+        print(f"- mean sal_in_gaze:                 {m['sal_in_gaze'].mean():.3f}")
+        print("Pearson correlation matrix:")
+        print(corr.round(3))
+
+    if roi_counts is not None:
         print(f"YOLOv12 ROI count stats: "
               f"min={roi_counts.min()}, "
               f"median={int(pd.Series(roi_counts).median())}, "
               f"mean={roi_counts.mean():.2f}, "
               f"max={roi_counts.max()}")
 
+
+if __name__ == "__main__":
+    main()
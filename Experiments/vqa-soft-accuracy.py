@@ -22,12 +22,44 @@ Example:
 from __future__ import annotations
 
 import argparse
+import importlib.util
 import json
+import mmap
+import os
 import re
+import shutil
 import sys
-from collections import defaultdict
+import tempfile
+from contextlib import nullcontext, suppress
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, List, Tuple, Any, Iterable
+from typing import Dict, List, Tuple, Any, BinaryIO, Iterable
+
+import numpy as np
+import pandas as pd
+
+# Shared best-effort pickle caches. The scripts are run directly from different folders,
+# so each loads Experiments/pickle_cache.py by file path rather than through sys.path.
+_spec = importlib.util.spec_from_file_location("pickle_cache", Path(__file__).resolve().parent / "pickle_cache.py")
+pickle_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pickle_cache)
+
+# Faster JSON parsing when orjson is installed; stdlib json otherwise. Both
+# accept UTF-8 bytes, and orjson.JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """UTF-8 JSON (compact, or indented by 2 spaces), with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
 
 
 # ----------------------------
@@ -172,9 +204,19 @@ _MANUAL_MAP: Dict[str, str] = {
     "ten": "10",
 }
 
-_ARTICLES = {"a", "an", "the"}
+_ARTICLES = frozenset({"a", "an", "the"})
+
+# Number words, articles (dropped as "") and contractions folded into one per-word
+# rewrite. The three maps have disjoint keys, and no number or contraction maps
+# onto a key of another, so a single lookup matches applying them in sequence.
+_WORD_REWRITE: Dict[str, str] = {**_CONTRACTIONS, **_MANUAL_MAP, **dict.fromkeys(_ARTICLES, "")}
 
-_PERIOD_STRIP = re.compile(r"(?!<=\d)(\.)(?!\d)")
+# VQAEval writes this as (?!<=\d)(\.)(?!\d); its (?!<=\d) lookahead can never see "<=" in
+# front of the ".", so it is a no-op and only "a period not followed by a digit" remains.
+# Deliberate deviation: VQAEval passes re.UNICODE (32) as sub()'s count and so strips at
+# most 32 periods per answer; here every such period is stripped, so answers with more
+# than 32 of them can score differently from the official eval.
+_PERIOD_STRIP = re.compile(r"\.(?!\d)")
 _COMMA_STRIP = re.compile(r"(\d)(\,)(\d)")
 _PUNCT_LIST = [
     ";",
@@ -201,6 +243,11 @@ _PUNCT_LIST = [
 ]
 
 
+# Punctuation is either replaced by a space or deleted; both as one str.translate pass
+_PUNCT_TO_SPACE = str.maketrans(dict.fromkeys(_PUNCT_LIST, " "))
+_PUNCT_DELETE = str.maketrans(dict.fromkeys(_PUNCT_LIST, None))
+
+
 def _preclean(s: str) -> str:
     if s is None:
         return ""
@@ -208,29 +255,35 @@ def _preclean(s: str) -> str:
 
 
 def _process_punctuation(in_text: str) -> str:
-    out_text = in_text
-    for p in _PUNCT_LIST:
-        if (p + " " in in_text or " " + p in in_text) or (re.search(_COMMA_STRIP, in_text) is not None):
-            out_text = out_text.replace(p, "")
-        else:
-            out_text = out_text.replace(p, " ")
-    out_text = _PERIOD_STRIP.sub("", out_text, re.UNICODE)
+    # A digit,digit comma deletes all punctuation; otherwise a mark is deleted when
+    # it touches a space in the input and replaced by a space everywhere else
+    if _COMMA_STRIP.search(in_text) is not None:
+        table = _PUNCT_DELETE
+    else:
+        # Only marks that occur at all need the two adjacency searches
+        present = [p for p in _PUNCT_LIST if p in in_text]
+        touching = [p for p in present if p + " " in in_text or " " + p in in_text]
+        table = {**_PUNCT_TO_SPACE, **dict.fromkeys(map(ord, touching))} if touching else _PUNCT_TO_SPACE
+    out_text = in_text.translate(table)
+    out_text = _PERIOD_STRIP.sub("", out_text)
     return out_text
 
 
 def _process_digit_article(in_text: str) -> str:
-    out_words: List[str] = []
-    temp_text = in_text.lower().split()
-    for w in temp_text:
-        w = _MANUAL_MAP.setdefault(w, w)
-        if w not in _ARTICLES:
-            out_words.append(w)
+    rewritten = (_WORD_REWRITE.get(w, w) for w in in_text.lower().split())
+    return " ".join(w for w in rewritten if w)
 
-    for i, w in enumerate(out_words):
-        if w in _CONTRACTIONS:
-            out_words[i] = _CONTRACTIONS[w]
 
-    return " ".join(out_words)
+@lru_cache(maxsize=1 << 16)
+def _norm_for_vqa(s: str) -> str:
+    # VQA answers repeat a lot ("yes", "no", "2", ...), so each distinct precleaned
+    # string only goes through the punctuation/digit/article passes once
+    if s.isalnum():
+        # Single word without punctuation or periods (most answers): the punctuation
+        # pass is a no-op and the word pass is one lookup
+        w = s.lower()
+        return _WORD_REWRITE.get(w, w)
+    return _process_digit_article(_process_punctuation(s))
 
 
 def _maybe_normalize_for_vqa(gt_answers: List[str], pred_answer: str) -> Tuple[List[str], str, bool]:
@@ -241,24 +294,67 @@ def _maybe_normalize_for_vqa(gt_answers: List[str], pred_answer: str) -> Tuple[L
     if not do_norm:
         return gt_clean, pred_clean, False
 
-    gt_norm = [_process_digit_article(_process_punctuation(a)) for a in gt_clean]
-    pred_norm = _process_digit_article(_process_punctuation(pred_clean))
+    gt_norm = [_norm_for_vqa(a) for a in gt_clean]
+    pred_norm = _norm_for_vqa(pred_clean)
     return gt_norm, pred_norm, True
 
 
 def vqa_official_accuracy(pred_answer: str, human_answers: List[str]) -> Tuple[float, int, str, List[str], bool]:
+    # One sample through the batch scorer, so the accuracy formula lives in one place
     humans_used, pred_used, used_norm = _maybe_normalize_for_vqa(human_answers, pred_answer)
+    acc, m_total = vqa_official_accuracy_batch([pred_used], [humans_used])
+    return float(acc[0]), int(m_total[0]), pred_used, humans_used, used_norm
+
+
+def vqa_official_accuracy_batch(preds_used: List[str], humans_used: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Official VQA accuracy for many samples at once, on already normalized answers.
+    All human answers are compared against their sample's prediction in one flat
+    array. The leave-one-out accuracy over the humans is evaluated in closed form
+    per sample: leaving out one of the m_total matching answers leaves m_total - 1
+    matches, leaving out any other answer leaves m_total.
+    Returns (accuracy, m_total) arrays.
+    """
+    n = np.fromiter(map(len, humans_used), dtype=np.int64, count=len(humans_used))
+    humans = np.fromiter(chain.from_iterable(humans_used), dtype=object, count=int(n.sum()))
+
+    # One hash pass maps every distinct answer string to an integer code, so the
+    # answer comparison below is an int64 array equality instead of string compares
+    codes, _ = pd.factorize(np.concatenate([humans, np.array(preds_used, dtype=object)]))
+    human_codes, pred_codes = codes[:len(humans)], codes[len(humans):]
+
+    m_total = np.bincount(
+        np.repeat(np.arange(len(n)), n), weights=human_codes == np.repeat(pred_codes, n), minlength=len(n)
+    ).astype(np.int64)
+
+    acc_if_match = np.minimum(1.0, (m_total - 1) / 3.0)
+    acc_if_not = np.minimum(1.0, m_total / 3.0)
+    acc = np.divide(
+        m_total * acc_if_match + (n - m_total) * acc_if_not, n,
+        out=np.zeros(len(n)), where=n > 0,
+    )
+    return acc, m_total
+
 
-    m_total = sum(1 for a in humans_used if a == pred_used)
+# Samples per vqa_official_accuracy_batch call
+SCORE_CHUNK = 4096
 
-    gt_acc: List[float] = []
-    for i in range(len(humans_used)):
-        other = [humans_used[j] for j in range(len(humans_used)) if j != i]
-        matching = sum(1 for a in other if a == pred_used)
-        gt_acc.append(min(1.0, float(matching) / 3.0))
 
-    acc = float(sum(gt_acc)) / float(len(gt_acc)) if gt_acc else 0.0
-    return acc, m_total, pred_used, humans_used, used_norm
+def _score_in_chunks(
+    samples: Iterable[Tuple[str, str, str, str, str, List[str], bool]],
+) -> Iterable[Tuple[Tuple[str, str, str, str, str, List[str], bool], float, int]]:
+    """
+    Yields (sample, accuracy, m_total) for each normalized sample, in order.
+    vqa_official_accuracy_batch runs on SCORE_CHUNK samples at a time, so only one
+    chunk of samples is held in memory.
+    """
+    it = iter(samples)
+    while True:
+        chunk = list(islice(it, SCORE_CHUNK))
+        if not chunk:
+            return
+        acc, m_total = vqa_official_accuracy_batch([r[4] for r in chunk], [r[5] for r in chunk])
+        yield from zip(chunk, acc.tolist(), m_total.tolist())
 
 
 # ----------------------------
@@ -266,24 +362,70 @@ def vqa_official_accuracy(pred_answer: str, human_answers: List[str]) -> Tuple[f
 # ----------------------------
 
 def _load_prepared_dataset(path: Path) -> Dict[str, Dict[str, Any]]:
-    data = json.loads(path.read_text(encoding="utf-8"))
+    """
+    prepared.json indexed by id. The index is pickled next to the file
+    (<name>.cache.pkl) and reused until prepared.json's mtime changes.
+    """
+    stamp = path.stat().st_mtime_ns
+    cache_path = path.with_name(path.stem + ".cache.pkl")
+    cached = pickle_cache.read_cache(cache_path)
+    if cached is not None and cached.get("stamp") == stamp:
+        return cached["by_id"]
+
+    data = _json_loads(path.read_bytes())
     by_id: Dict[str, Dict[str, Any]] = {}
     for item in data:
         sid = str(item.get("id"))
         by_id[sid] = item
+
+    pickle_cache.write_cache(cache_path, {"stamp": stamp, "by_id": by_id})
     return by_id
 
 
 def _iter_jsonl(path: Path) -> Iterable[Dict[str, Any]]:
-    with path.open("r", encoding="utf-8") as f:
-        for line_no, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON on line {line_no} of {path}: {e}") from e
+    # The file is memory-mapped and split by mmap.readline (a memchr in C); lines
+    # stay bytes, with no text decode or strip copy before parsing
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # an empty file cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from _parse_jsonl_lines(iter(mm.readline, b""), path)
+
+
+def _parse_jsonl_lines(lines: Iterable[bytes], path: Path) -> Iterable[Dict[str, Any]]:
+    for line_no, line in enumerate(lines, start=1):
+        if not line or line.isspace():
+            continue
+        try:
+            yield _json_loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_no} of {path}: {e}") from e
+
+
+def _write_report(out_path: Path, summary: Dict[str, Any], details: BinaryIO, n_details: int) -> None:
+    """
+    Write {"summary": ..., "details": [...]} to out_path in the layout of
+    json.dumps(report, indent=2, ensure_ascii=False). details holds the n_details
+    already serialized records. The report is assembled in a temp file next to
+    out_path and then renamed onto it, so a failed run keeps the previous report.
+    """
+    tmp = tempfile.NamedTemporaryFile(dir=out_path.parent, prefix=out_path.name + ".", suffix=".tmp", delete=False)
+    try:
+        with tmp as f:
+            f.write(b'{\n  "summary": ' + _json_dumps(summary, indent=True).replace(b"\n", b"\n  "))
+            f.write(b',\n  "details": [')
+            details.seek(0)
+            shutil.copyfileobj(details, f)
+            f.write(b"\n  ]\n}" if n_details else b"]\n}")
+        # Temp files are created owner-only; give the report the usual umask mode
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp.name, 0o666 & ~umask)
+        os.replace(tmp.name, out_path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp.name)
+        raise
 
 
 def _safe_float(x: Any, default: float = 0.0) -> float:
@@ -341,41 +483,49 @@ def main() -> int:
 
     dataset_by_id = _load_prepared_dataset(dataset_path)
 
-    # Per-preprocessor accumulators
-    acc_sum: Dict[str, float] = defaultdict(float)
-    count: Dict[str, int] = defaultdict(int)
-
-    # Detailed per-line results (optional for output file)
-    detailed: List[Dict[str, Any]] = []
+    out_path = Path(args.out) if args.out else None
+    if out_path is not None:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
 
     missing_in_dataset = 0
     total_lines = 0
 
-    for row in _iter_jsonl(responses_path):
-        total_lines += 1
+    def matched_samples() -> Iterable[Tuple[str, str, str, str, str, List[str], bool]]:
+        nonlocal missing_in_dataset, total_lines
+        for row in _iter_jsonl(responses_path):
+            total_lines += 1
 
-        preproc = str(row.get("preprocessor", "UNKNOWN"))
-        sample_id = str(row.get("sample_id", ""))
-        pred = str(row.get("assistant_text", ""))
+            preproc = str(row.get("preprocessor", "UNKNOWN"))
+            sample_id = str(row.get("sample_id", ""))
+            pred = str(row.get("assistant_text", ""))
 
-        item = dataset_by_id.get(sample_id)
-        if item is None:
-            missing_in_dataset += 1
-            continue
+            item = dataset_by_id.get(sample_id)
+            if item is None:
+                missing_in_dataset += 1
+                continue
 
-        prompt = str(item.get("question", ""))
-        human_answers = item.get("answers", [])
-        if not isinstance(human_answers, list) or len(human_answers) == 0:
-            continue
+            prompt = str(item.get("question", ""))
+            human_answers = item.get("answers", [])
+            if not isinstance(human_answers, list) or len(human_answers) == 0:
+                continue
 
-        acc, m_total, pred_used, humans_used, used_norm = vqa_official_accuracy(pred, [str(a) for a in human_answers])
+            humans_used, pred_used, used_norm = _maybe_normalize_for_vqa([str(a) for a in human_answers], pred)
+            yield preproc, sample_id, prompt, pred, pred_used, humans_used, used_norm
 
-        acc_sum[preproc] += acc
-        count[preproc] += 1
+    acc_sum: Dict[str, float] = {}
+    count: Dict[str, int] = {}
 
-        if args.out:
-            detailed.append(
-                {
+    # Samples are scored one chunk at a time and each detail record is serialized to
+    # an anonymous temp file as soon as it is scored, so no list of all samples is kept
+    with tempfile.TemporaryFile(dir=out_path.parent) if out_path is not None else nullcontext() as f:
+        n_details = 0
+        for sample, a, m in _score_in_chunks(matched_samples()):
+            preproc, sample_id, prompt, pred, pred_used, humans_used, used_norm = sample
+            acc_sum[preproc] = acc_sum.get(preproc, 0.0) + a
+            count[preproc] = count.get(preproc, 0) + 1
+
+            if f is not None:
+                record = {
                     "preprocessor": preproc,
                     "sample_id": sample_id,
                     "question": prompt,
@@ -383,45 +533,43 @@ def main() -> int:
                     "prediction_used_for_eval": pred_used,
                     "human_answers_used_for_eval": humans_used,
                     "used_normalization": used_norm,
-                    "matches_m_total": m_total,
-                    "accuracy_official_vqa": acc,
+                    "matches_m_total": m,
+                    "accuracy_official_vqa": a,
                 }
-            )
-
-    # Summary
-    per_preproc = {}
-    overall_acc_sum = 0.0
-    overall_n = 0
-
-    for p in sorted(count.keys()):
-        n = count[p]
-        a = acc_sum[p] / n if n else 0.0
-        per_preproc[p] = {"n": n, "accuracy": a}
-        overall_acc_sum += acc_sum[p]
-        overall_n += n
-
-    overall_acc = overall_acc_sum / overall_n if overall_n else 0.0
-
-    summary = {
-        "dataset": str(dataset_path),
-        "responses": str(responses_path),
-        "total_response_lines": total_lines,
-        "matched_predictions": overall_n,
-        "missing_in_dataset": missing_in_dataset,
-        "overall_accuracy_official_vqa": overall_acc,
-        "per_preprocessor": per_preproc,
-    }
-
-    # Write report if requested
-    if args.out:
-        out_path = Path(args.out)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_obj = {"summary": summary, "details": detailed}
-        out_path.write_text(json.dumps(out_obj, indent=2, ensure_ascii=False), encoding="utf-8")
+                f.write(b",\n    " if n_details else b"\n    ")
+                f.write(_json_dumps(record, indent=True).replace(b"\n", b"\n    "))
+                n_details += 1
+
+        # Summary
+        per_preproc = {}
+        overall_acc_sum = 0.0
+        overall_n = 0
+
+        for p in sorted(count.keys()):
+            n = count[p]
+            a = acc_sum[p] / n if n else 0.0
+            per_preproc[p] = {"n": n, "accuracy": a}
+            overall_acc_sum += acc_sum[p]
+            overall_n += n
+
+        overall_acc = overall_acc_sum / overall_n if overall_n else 0.0
+
+        summary = {
+            "dataset": str(dataset_path),
+            "responses": str(responses_path),
+            "total_response_lines": total_lines,
+            "matched_predictions": overall_n,
+            "missing_in_dataset": missing_in_dataset,
+            "overall_accuracy_official_vqa": overall_acc,
+            "per_preprocessor": per_preproc,
+        }
+
+        if f is not None:
+            _write_report(out_path, summary, f, n_details)
 
     # Print
     if args.json:
-        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        sys.stdout.buffer.write(_json_dumps(summary, indent=True) + b"\n")
     else:
         print(f"Dataset:   {dataset_path}")
         print(f"Responses: {responses_path}")
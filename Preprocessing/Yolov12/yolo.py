@@ -2,7 +2,11 @@ from ultralytics import YOLO
 import onnx
 
 model = YOLO("yolo12n.pt")
-model.export(format="onnx", opset=21)
+# Static 640x640 input (what YoloOnnxDetector feeds) and a simplified graph, so
+# ONNX Runtime sees fixed shapes and can fuse Conv+BN+SiLU. Weights stay FP32:
+# the C# detector builds a DenseTensor<float> input.
+model.export(format="onnx", opset=21, imgsz=640, dynamic=False, simplify=True)
 
 m = onnx.load("yolo12n.onnx")
-print("op version: (... , Version)", [(op.domain, op.version) for op in m.opset_import])
\ No newline at end of file
+onnx.checker.check_model(m)
+print("op version: (... , Version)", [(op.domain, op.version) for op in m.opset_import])
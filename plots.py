@@ -1,83 +1,271 @@
+import csv
+import importlib.util
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib import cbook
+from matplotlib.figure import Figure
+
+# Shared best-effort pickle caches. The scripts are run directly from different folders,
+# so each loads Experiments/pickle_cache.py by file path rather than through sys.path.
+_spec = importlib.util.spec_from_file_location("pickle_cache", Path(__file__).resolve().parent / "Experiments" / "pickle_cache.py")
+pickle_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pickle_cache)
+
+# Optional faster parsers; the script falls back to pandas / stdlib json without them
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = pa_csv = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # "Define" the model you want to plot
 TARGET_MODEL = ["gpt-realtime-mini", "gpt-realtime","gpt-5.1-2025-11-13", "gpt-5-mini-2025-08-07", "gpt-5-nano-2025-08-07", "gpt-4.1-2025-04-14", "gpt-4.1-mini-2025-04-14"]
 
 
 
-def load_all_metrics(log_root: str = "logs") -> pd.DataFrame:
+# Combined metrics frame is cached here and reused until any experiment changes
+CACHE_FILE = Path("_cache") / "plots_metrics.pkl"
+
+
+def _experiment_dirs(log_root: Path) -> list[Path]:
     """
-    Walk through the logs folder and collect all metrics.csv files.
-    For each experiment, also read config.json and attach metadata columns.
+    Experiment folders that contain both metrics.csv and config.json.
     """
-    log_root = Path(log_root)
-    all_rows = []
+    return [
+        d for d in sorted(log_root.iterdir())
+        if d.is_dir() and (d / "metrics.csv").exists() and (d / "config.json").exists()
+    ]
 
-    for exp_dir in log_root.iterdir():
-        if not exp_dir.is_dir():
-            continue
 
-        metrics_path = exp_dir / "metrics.csv"
-        config_path = exp_dir / "config.json"
+def _cache_key(exp_dirs: list[Path]) -> list[tuple[str, int, int]]:
+    """
+    (folder name, metrics.csv mtime, config.json mtime) for every experiment.
+    Any added, removed or rewritten experiment changes the key.
+    """
+    return [
+        (d.name, (d / "metrics.csv").stat().st_mtime_ns, (d / "config.json").stat().st_mtime_ns)
+        for d in exp_dirs
+    ]
+
+
+def _read_json(path: Path) -> dict:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
 
-        if not metrics_path.exists() or not config_path.exists():
-            continue
+def _read_header(path: Path) -> list[str]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return next(csv.reader(f), [])
 
-        # Load config metadata
-        with open(config_path, "r", encoding="utf-8") as f:
-            cfg = json.load(f)
 
-        # Load metrics
-        df = pd.read_csv(metrics_path)
+def _read_csv(path: Path) -> pd.DataFrame:
+    # Only parse the boxplot columns this file has, with fixed dtypes instead of inferred ones
+    dtypes = {c: METRICS_DTYPES[c] for c in _read_header(path) if c in METRICS_DTYPES}
 
-        # Attach metadata columns for later grouping
-        df["experiment_id"] = cfg.get("experiment_id", exp_dir.name)
-        df["model"] = cfg.get("model", "unknown")
-        df["dataset_name"] = cfg.get("dataset_name", "unknown")
-        df["timestamp"] = cfg.get("timestamp")
+    # pyarrow parses multithreaded into columnar buffers and hands them to pandas without per-row objects.
+    # (An empty include_columns would mean "all columns" to pyarrow.)
+    if pa_csv is not None and dtypes:
+        convert = pa_csv.ConvertOptions(
+            include_columns=list(dtypes),
+            column_types={c: pa.type_for_alias(t) for c, t in dtypes.items()},
+        )
+        return pa_csv.read_csv(path, convert_options=convert).to_pandas(split_blocks=True, self_destruct=True)
+    return pd.read_csv(path, usecols=list(dtypes), dtype=dtypes)
 
-        all_rows.append(df)
 
-    if not all_rows:
+def _load_one(exp_dir: Path) -> tuple[pd.DataFrame, dict]:
+    """
+    Read one experiment's metrics.csv and the metadata from its config.json.
+    """
+    # Load config metadata
+    cfg = _read_json(exp_dir / "config.json")
+
+    # Load metrics
+    df = _read_csv(exp_dir / "metrics.csv")
+
+    meta = {
+        "experiment_id": cfg.get("experiment_id", exp_dir.name),
+        "model": cfg.get("model", "unknown"),
+        "dataset_name": cfg.get("dataset_name", "unknown"),
+        "timestamp": cfg.get("timestamp"),
+    }
+    return df, meta
+
+
+def load_all_metrics(log_root: str = "logs", use_cache: bool = True) -> pd.DataFrame:
+    """
+    Walk through the logs folder and collect all metrics.csv files.
+    For each experiment, also read config.json and attach metadata columns.
+
+    Only the boxplot columns (METRICS_DTYPES) are read from metrics.csv.
+
+    The combined frame is pickled to logs/_cache/ and reused on the next run
+    as long as no metrics.csv or config.json changed.
+    """
+    log_root = Path(log_root)
+    exp_dirs = _experiment_dirs(log_root)
+    key = _cache_key(exp_dirs)
+    cache_path = log_root / CACHE_FILE
+
+    if use_cache:
+        cached = pickle_cache.read_cache(cache_path) or {}
+        if cached.get("key") == key and cached.get("dtypes") == METRICS_DTYPES:
+            return cached["df"]
+
+    # Experiments are independent and the parsers release the GIL, so read them concurrently.
+    # ex.map keeps the results in exp_dirs order.
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+        loaded = list(ex.map(_load_one, exp_dirs))
+
+    if not loaded:
         raise RuntimeError(f"No metrics.csv files found in {log_root.resolve()}")
 
+    all_rows = [df for df, _ in loaded]
     df_all = pd.concat(all_rows, ignore_index=True)
 
-    # Parse timestamp if present
-    if "timestamp" in df_all.columns:
-        df_all["timestamp"] = pd.to_datetime(df_all["timestamp"], errors="coerce")
+    # Attach metadata columns for later grouping. Values are constant per experiment, so
+    # store them dictionary-encoded (one code per row) after the concat instead of
+    # broadcasting full string columns into every frame and copying them again.
+    lengths = [len(df) for df in all_rows]
+    for col in ("experiment_id", "model", "dataset_name"):
+        codes, uniques = pd.factorize(pd.Series([meta[col] for _, meta in loaded]))
+        df_all[col] = pd.Categorical.from_codes(np.repeat(codes, lengths), categories=uniques)
+
+    # Parse the one timestamp per experiment, then broadcast the parsed values to the rows
+    timestamps = pd.to_datetime(pd.Index([meta["timestamp"] for _, meta in loaded]), errors="coerce")
+    df_all["timestamp"] = timestamps.take(np.repeat(np.arange(len(loaded)), lengths))
+
+    if use_cache:
+        pickle_cache.write_cache(cache_path, {"key": key, "dtypes": METRICS_DTYPES, "df": df_all})
 
     return df_all
 
 
-def select_latest_run_for_model(df: pd.DataFrame, target_model: str) -> pd.DataFrame:
+def latest_experiment_per_model(df: pd.DataFrame) -> dict[str, str]:
+    """
+    Map every model to the experiment_id of its latest run: the experiment of
+    the model's row with the largest timestamp, found in one grouped argmax
+    over the rows (no per-experiment max first).
+    """
+    if "timestamp" not in df.columns:
+        # No timestamps at all: the ids start with the run's date, so take the largest one
+        return {
+            model: max(exp_ids.tolist())
+            for model, exp_ids in df.groupby("model", sort=False, observed=True)["experiment_id"]
+        }
+
+    has_time = df["timestamp"].notna()
+    rows = df.loc[has_time, "timestamp"].groupby(df.loc[has_time, "model"], sort=False, observed=True).idxmax()
+    latest = dict(zip(rows.index, df.loc[rows.to_numpy(), "experiment_id"]))
+
+    for model, exp_ids in df.loc[~has_time].groupby("model", sort=False, observed=True)["experiment_id"]:
+        if model not in latest:
+            # No usable timestamps: the ids start with the run's date, so take the largest one
+            latest[model] = max(exp_ids.tolist())
+    return latest
+
+
+def select_latest_run_for_model(
+    df: pd.DataFrame,
+    target_model: str,
+    latest_exp_ids: dict[str, str] | None = None,
+) -> pd.DataFrame:
     """
     Filter to a single model and return only the latest experiment_id
     based on the timestamp column.
+
+    Pass the result of latest_experiment_per_model() as latest_exp_ids when
+    selecting several models from the same frame.
     """
-    # Filter by model
-    df_model = df[df["model"] == target_model].copy()
-    if df_model.empty:
-        raise RuntimeError(f"No runs found for model {target_model!r}")
+    if latest_exp_ids is None:
+        latest_exp_ids = latest_experiment_per_model(df)
 
-    if "timestamp" not in df_model.columns or df_model["timestamp"].isna().all():
-        # If no usable timestamps, just take the most recent experiment_id by name
-        latest_exp_id = df_model["experiment_id"].iloc[-1]
-    else:
-        # For each experiment, take its max timestamp, then choose the latest one
-        exp_times = df_model.groupby("experiment_id")["timestamp"].max()
-        latest_exp_id = exp_times.idxmax()
+    latest_exp_id = latest_exp_ids.get(target_model)
+    if latest_exp_id is None:
+        raise RuntimeError(f"No runs found for model {target_model!r}")
 
-    df_latest = df_model[df_model["experiment_id"] == latest_exp_id].copy()
+    # Boolean indexing already returns a new frame and callers only read it, so no extra copy
+    df_latest = df[df["experiment_id"] == latest_exp_id]
     print(f"Using latest run for model {target_model!r}: experiment_id = {latest_exp_id}")
     return df_latest
 
 
-def plot_boxplots(df: pd.DataFrame, group_by: str = "model", save_dir: Path | None = None) -> None:
+# Columns shown in the boxplots; you can adjust which columns you want to show
+LATENCY_COLS = [
+    "end_to_end_ms",
+    "send_to_response_created_ms",
+    "response_created_to_first_token_ms",
+    "first_token_to_done_ms",
+]
+
+TOKEN_COLS = [
+    "input_tokens",
+    "output_tokens",
+    "total_tokens",
+    "text_input_tokens",
+    "image_input_tokens",
+]
+
+COST_COL = "total_cost_usd"
+
+# The metrics.csv columns load_all_metrics() reads, with their dtypes. Latencies and
+# token counts fit float32 (box statistics are computed in float64 anyway).
+METRICS_DTYPES = {
+    **dict.fromkeys(LATENCY_COLS + TOKEN_COLS, "float32"),
+    COST_COL: "float64",
+}
+
+
+# Box plots are simple line art; 150 dpi keeps them sharp at a fraction of the encode cost
+BOXPLOT_DPI = 150
+
+
+def _boxplot_stats(df: pd.DataFrame, group_by: str, cols: list[str]) -> dict[str, list[dict]]:
+    """
+    Box and whisker statistics for every column in cols, grouped by group_by.
+    Groups the frame once for all columns and returns {column: [stats per group]}
+    ready for Axes.bxp (same whiskers and fliers as DataFrame.boxplot).
+    """
+    # Row positions per group, computed once; every column is then sliced from its
+    # numpy array instead of materializing a sub-frame per group
+    groups = df.groupby(group_by, sort=True, observed=True).indices
+
+    stats = {}
+    for col in cols:
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        stats[col] = []
+        for label, idx in groups.items():
+            group = values[idx]
+            group = group[~np.isnan(group)]
+            stats[col].extend(cbook.boxplot_stats(group, labels=[str(label)]))
+    return stats
+
+
+def boxplot_stats(df: pd.DataFrame, group_by: str = "model") -> dict[str, list[dict]]:
+    """
+    Statistics for every boxplot column present in df, as consumed by plot_boxplots().
+    """
+    cols = [c for c in LATENCY_COLS + TOKEN_COLS + [COST_COL] if c in df.columns]
+    return _boxplot_stats(df, group_by, cols)
+
+
+def plot_boxplots(
+    df: pd.DataFrame | None,
+    group_by: str = "model",
+    save_dir: Path | None = None,
+    stats: dict[str, list[dict]] | None = None,
+) -> None:
     """
     Create box and whisker plots for
     - latency
@@ -85,101 +273,100 @@ def plot_boxplots(df: pd.DataFrame, group_by: str = "model", save_dir: Path | No
     - cost
 
     Grouped by the given column (for example model or experiment_id).
-    """
-    # You can adjust which columns you want to show
-    latency_cols = [
-        "end_to_end_ms",
-        "send_to_response_created_ms",
-        "response_created_to_first_token_ms",
-        "first_token_to_done_ms",
-    ]
 
-    token_cols = [
-        "input_tokens",
-        "output_tokens",
-        "total_tokens",
-        "text_input_tokens",
-        "image_input_tokens",
-    ]
-
-    cost_col = "total_cost_usd"
+    Pass stats from boxplot_stats() to reuse statistics that were already
+    computed for the same frame; df is then not needed.
+    """
+    if stats is None:
+        stats = boxplot_stats(df, group_by)
 
-    # Filter to only columns that actually exist
-    latency_cols = [c for c in latency_cols if c in df.columns]
-    token_cols = [c for c in token_cols if c in df.columns]
-    has_cost = cost_col in df.columns
+    # Only columns that actually exist in the data have statistics
+    latency_cols = [c for c in LATENCY_COLS if c in stats]
+    token_cols = [c for c in TOKEN_COLS if c in stats]
+    has_cost = COST_COL in stats
+    cost_col = COST_COL
 
     # Latency boxplots
     if latency_cols:
-        fig, axes = plt.subplots(1, len(latency_cols), figsize=(4 * len(latency_cols), 5), squeeze=False)
+        fig = Figure(figsize=(4 * len(latency_cols), 5), layout="constrained")
+        axes = fig.subplots(1, len(latency_cols), squeeze=False)
         axes = axes[0]
 
         for ax, col in zip(axes, latency_cols):
-            df.boxplot(column=col, by=group_by, ax=ax)
+            ax.bxp(stats[col])
+            ax.grid(True)
             ax.set_title(col)
             ax.set_xlabel(group_by)
             ax.set_ylabel("milliseconds")
 
         fig.suptitle("Latency boxplots")
-        plt.tight_layout()
 
         if save_dir:
-            fig.savefig(save_dir / "latency_boxplots.png", dpi=200)
-
-        plt.close(fig)
+            fig.savefig(save_dir / "latency_boxplots.png", dpi=BOXPLOT_DPI)
 
 
     # Token usage boxplots
     if token_cols:
-        fig, axes = plt.subplots(1, len(token_cols), figsize=(4 * len(token_cols), 5), squeeze=False)
+        fig = Figure(figsize=(4 * len(token_cols), 5), layout="constrained")
+        axes = fig.subplots(1, len(token_cols), squeeze=False)
         axes = axes[0]
 
         for ax, col in zip(axes, token_cols):
-            df.boxplot(column=col, by=group_by, ax=ax)
+            ax.bxp(stats[col])
+            ax.grid(True)
             ax.set_title(col)
             ax.set_xlabel(group_by)
             ax.set_ylabel("tokens")
 
         fig.suptitle("Token usage boxplots")
-        plt.tight_layout()
 
         if save_dir:
-            fig.savefig(save_dir / "tokens_boxplots.png", dpi=200)
-
-        plt.close(fig)
+            fig.savefig(save_dir / "tokens_boxplots.png", dpi=BOXPLOT_DPI)
 
 
     # Cost boxplot
     if has_cost:
-        fig, ax = plt.subplots(figsize=(6, 5))
-        df.boxplot(column=cost_col, by=group_by, ax=ax)
+        fig = Figure(figsize=(6, 5), layout="constrained")
+        ax = fig.subplots()
+        ax.bxp(stats[cost_col])
+        ax.grid(True)
         ax.set_title("Total cost per call")
         ax.set_xlabel(group_by)
         ax.set_ylabel("USD")
         fig.suptitle("Cost boxplot")
-        plt.tight_layout()
 
         if save_dir:
-            fig.savefig(save_dir / "cost_boxplot.png", dpi=200)
-
-        plt.close(fig)
+            fig.savefig(save_dir / "cost_boxplot.png", dpi=BOXPLOT_DPI)
 
 
 
 def main():
     df_all = load_all_metrics("logs")
+    latest_exp_ids = latest_experiment_per_model(df_all)
+
     # Run for each target model
+    tasks = []
     for model in TARGET_MODEL:
         # Keep only the latest run for the selected model
-        df_latest = select_latest_run_for_model(df_all, model)
+        df_latest = select_latest_run_for_model(df_all, model, latest_exp_ids)
 
         # Determine folder of the latest experiment
         exp_id = df_latest["experiment_id"].iloc[0]
         output_dir = Path("logs") / exp_id
         output_dir.mkdir(exist_ok=True)
 
-        # Produce and save the plots
-        plot_boxplots(df_latest, group_by="experiment_id", save_dir=output_dir)
+        # Summarise here so the workers only receive the box statistics, not the rows
+        tasks.append((boxplot_stats(df_latest, group_by="experiment_id"), output_dir))
+
+    # Produce and save the plots. Rendering and PNG encoding are CPU bound and
+    # independent per model, so each model's figures are drawn in its own process.
+    with ProcessPoolExecutor(max_workers=max(1, min(len(tasks), os.cpu_count() or 1))) as ex:
+        futures = [
+            ex.submit(plot_boxplots, None, group_by="experiment_id", save_dir=output_dir, stats=stats)
+            for stats, output_dir in tasks
+        ]
+        for fut in futures:
+            fut.result()
 
 
 if __name__ == "__main__":